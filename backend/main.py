@@ -2,23 +2,32 @@ from agents import Runner
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import AsyncGenerator
-from fastapi.responses import StreamingResponse
-import json
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+import tzlocal
 
 # Import from refactored modules
+from mcp_client import aclose_all
 from memory import retrieve_memory
 from agent_definitions.calendar_agents import triage_agent
-from streaming.formatters import format_stream_event
-from streaming.utils import extract_usage_info
+from streaming import EventBatcher, extract_usage_info, format_stream_event_bytes
+from streaming.formatters import TEXT_DELTA_PREFIX
 
 logging.getLogger("openai.agents").setLevel(logging.DEBUG)
 logging.getLogger("openai.agents").addHandler(logging.StreamHandler())
+logger = logging.getLogger(__name__)
 
 load_dotenv()
-app = FastAPI()
+# JSON responses are encoded with orjson, straight to bytes
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# The host timezone is fixed for the life of the process
+LOCAL_TZ = tzlocal.get_localzone()
 
 # Configure CORS to allow requests from frontend
 app.add_middleware(
@@ -35,74 +44,124 @@ app.add_middleware(
 )
 
 
+def _is_discriminator_error(err: AttributeError) -> bool:
+    """True for the SDK's Union type discriminator errors.
+
+    Reads AttributeError.name instead of formatting the message; only errors raised
+    without a name fall back to scanning the text.
+    """
+    if err.name is not None:
+        return err.name == "__discriminator__"
+    return "__discriminator__" in str(err)
+
+
+# SSE framing and response headers are constant across requests
+_SSE_DATA = b"data: "
+_SSE_END = b"\n\n"
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Cache-Control",
+}
+
+
+_TEXT_DELTA_FRAME = _SSE_DATA + TEXT_DELTA_PREFIX
+
+
+def _is_text_delta_frame(frame: bytes) -> bool:
+    return frame.startswith(_TEXT_DELTA_FRAME)
+
+
+def _sse_frame(event: dict) -> bytes:
+    """Encodes one SSE data frame. orjson returns bytes, so nothing is re-encoded."""
+    return _SSE_DATA + orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS) + _SSE_END
+
+
+# One strftime call for every field of the prompt prefix; "|" never occurs in them.
+# (strftime stops at an embedded NUL, so that cannot be the separator.)
+_DATE_INFO_FORMAT = "%Y-%m-%d|%A, %B %d, %Y|%H:%M:%S|%Z|%A|%U"
+
+
+@lru_cache(maxsize=1)
+def _current_date_info(minute: datetime) -> str:
+    """Builds the date/time prompt prefix. Keyed by the current minute, so requests
+    within the same minute reuse one string."""
+    day, long_date, clock, tz_name, weekday, week = minute.strftime(
+        _DATE_INFO_FORMAT
+    ).split("|")
+    return f"""Current Date/Time Information:
+- Today's date: {day} ({long_date})
+- Current time: {clock}
+- Timezone: {tz_name} (IANA: {LOCAL_TZ})
+- Current datetime (ISO format with timezone): {minute.isoformat()}
+- Day of week: {weekday}
+- Week of year: {week}
+
+IMPORTANT: When creating calendar events or meetings, always specify times in the user's timezone ({tz_name}).
+Use this information to interpret relative dates like "today", "tomorrow", "next week", etc.
+"""
+
+
 @app.post("/agent")
 async def agent(request: dict):
     """
     Main agent endpoint that uses a triage agent to route requests
     to specialist agents for calendar operations.
     """
-    logger = logging.getLogger(__name__)
     user_input = request.get("user_input")
-    logger.info(f"🤖 Agent received request: {user_input[:100]}...")
+    logger.info("🤖 Agent received request: %.100s...", user_input)
 
-    # Get current date/time information with timezone
-    import tzlocal
-
-    local_tz = tzlocal.get_localzone()
-    now = datetime.now(local_tz)
-    tz_name = now.strftime("%Z")
+    # Retrieval runs in a worker thread, overlapping the prompt prep below, so a
+    # slow memory lookup never blocks the event loop
+    mem_task = asyncio.create_task(asyncio.to_thread(retrieve_memory, user_input))
 
-    current_date_info = f"""Current Date/Time Information:
-- Today's date: {now.strftime("%Y-%m-%d")} ({now.strftime("%A, %B %d, %Y")})
-- Current time: {now.strftime("%H:%M:%S")}
-- Timezone: {tz_name} (IANA: {str(local_tz)})
-- Current datetime (ISO format with timezone): {now.isoformat()}
-- Day of week: {now.strftime("%A")}
-- Week of year: {now.strftime("%U")}
-
-IMPORTANT: When creating calendar events or meetings, always specify times in the user's timezone ({tz_name}).
-Use this information to interpret relative dates like "today", "tomorrow", "next week", etc.
-"""
+    # Get current date/time information with timezone
+    now = datetime.now(LOCAL_TZ)
+    current_date_info = _current_date_info(now.replace(second=0, microsecond=0))
 
-    mem = retrieve_memory(user_input)
+    mem = await mem_task
     prompt = f"""{current_date_info}
 
 Context from memory: {mem}
 
 User input: {user_input}"""
 
-    async def generate_stream() -> AsyncGenerator[str, None]:
+    async def generate_stream() -> AsyncGenerator[bytes, None]:
         try:
-            logger.info(
-                f"🚀 Running triage agent with current date: {now.strftime('%Y-%m-%d %H:%M:%S')}"
-            )
+            logger.info("🚀 Running triage agent with current date: %s", now)
             # Use the triage agent which will hand off to specialist agents
             result = Runner.run_streamed(triage_agent, input=prompt)
 
             # Wrap event streaming with error handling for Union type issues
             try:
                 async for event in result.stream_events():
+                    # Only the formatter call (which also encodes the event) is
+                    # guarded, for the errors attribute/dict access and encoding can
+                    # raise; the frame assembly and yield stay outside the handler
                     try:
                         # Process each event type with proper serialization
-                        formatted_event = format_stream_event(event, logger)
-                        if formatted_event:
-                            yield f"data: {json.dumps(formatted_event)}\n\n"
+                        payload = format_stream_event_bytes(event)
                     except AttributeError as attr_err:
                         # Handle Union type discriminator errors
-                        if "__discriminator__" in str(attr_err):
+                        if _is_discriminator_error(attr_err):
                             logger.warning(
                                 f"Skipping event due to Union type issue: {attr_err}"
                             )
                             continue
                         else:
                             raise
-                    except Exception as e:
+                    except (KeyError, TypeError) as e:
+                        # TypeError: a field orjson cannot encode (orjson.JSONEncodeError
+                        # subclasses it)
                         logger.error(f"Error processing individual event: {e}")
                         # Continue with next event instead of failing entirely
                         continue
+                    if payload:
+                        yield _SSE_DATA + payload + _SSE_END
             except AttributeError as attr_err:
                 # Handle Union type discriminator errors during iteration
-                if "__discriminator__" in str(attr_err):
+                if _is_discriminator_error(attr_err):
                     logger.error(
                         f"Stream iteration failed due to Union type issue: {attr_err}"
                     )
@@ -115,7 +174,7 @@ User input: {user_input}"""
                             else "Error during streaming",
                             "error": "Streaming interrupted due to Union type issue",
                         }
-                        yield f"data: {json.dumps(completion_event)}\n\n"
+                        yield _sse_frame(completion_event)
                         return
                     except Exception:
                         pass
@@ -130,7 +189,7 @@ User input: {user_input}"""
                 if hasattr(result, "usage")
                 else None,
             }
-            yield f"data: {json.dumps(completion_event)}\n\n"
+            yield _sse_frame(completion_event)
 
         except Exception as e:
             logger.error(f"Streaming error: {str(e)}", exc_info=True)
@@ -138,20 +197,30 @@ User input: {user_input}"""
                 "type": "error",
                 "message": str(e),
             }
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield _sse_frame(error_event)
 
     return StreamingResponse(
-        generate_stream(),
+        # Bursts of tool/run item events go out as one chunk, at most 5 ms late;
+        # text deltas are sent immediately
+        EventBatcher(bypass=_is_text_delta_frame).batch(generate_stream()),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
-        },
+        headers=_SSE_HEADERS,
     )
 
 
+@app.on_event("shutdown")
+async def close_mcp_sessions():
+    """Stops the MCP server sessions kept open across tool calls."""
+    await aclose_all()
+
+
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools back the /agent SSE stream with a C event loop and parser
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -3,12 +3,260 @@ MCP (Model Context Protocol) client helper for calling MCP server tools.
 Connects to the Dockerized MCP server instance.
 """
 
+from __future__ import annotations
+
+import asyncio
 import logging
 import os
 import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from typing import TYPE_CHECKING, AsyncIterator
+
+# The MCP SDK is imported where a session is opened, not at module load: it is heavy,
+# and processes that never call a tool (tests, tooling) shouldn't pay for it
+if TYPE_CHECKING:
+    from mcp import ClientSession, StdioServerParameters
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = Path(__file__).parent
+
+# Server configuration mapping, read from the environment once at import
+_SERVER_CONFIGS = {
+    "calendar": {
+        "container_name": os.getenv("MCP_CONTAINER_NAME", "calendar-mcp"),
+        "command": ["python", "/app/run_mcp_stdio.py"],
+        "local_path": "calendar-mcp/run_mcp_stdio.py",
+        "setup_instructions": "cd backend/calendar-mcp && make up",
+    },
+    "google-meet": {
+        "container_name": os.getenv("GOOGLE_MEET_MCP_CONTAINER", "google-meet-mcp"),
+        "command": ["node", "src/index.js"],
+        "local_path": None,  # No local fallback for Node server
+        "setup_instructions": "cd google-meet-mcp-server && make up",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _docker_params(server_name: str) -> StdioServerParameters:
+    """docker exec launch parameters for server_name, built once per server."""
+    from mcp import StdioServerParameters
+
+    config = _SERVER_CONFIGS[server_name]
+    return StdioServerParameters(
+        command="docker",
+        args=["exec", "-i", config["container_name"]] + config["command"],
+        env=None,
+    )
+
+
+class MCPConnection:
+    """
+    A long-lived stdio session to one MCP server.
+
+    The server process is started and the MCP handshake run once; every tool call
+    after that is a single JSON-RPC round trip over the same session. The stdio and
+    session context managers are entered and exited by one owner task, since anyio
+    requires their cancel scopes to be closed by the task that opened them.
+    """
+
+    def __init__(self, server_name: str, server_params: StdioServerParameters):
+        self.server_name = server_name
+        self._server_params = server_params
+        self._session: ClientSession | None = None
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None and not self._task.done()
+
+    async def start(self):
+        """Starts the server process and initializes the session."""
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        await ready
+
+    async def _run(self, ready: asyncio.Future):
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(
+                    stdio_client(self._server_params)
+                )
+                session = await stack.enter_async_context(ClientSession(read, write))
+                logger.info("📡 MCP session established")
+
+                await session.initialize()
+                logger.info("✅ MCP session initialized successfully")
+
+                self._session = session
+                ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"❌ MCP session to {self.server_name} ended: {e}")
+        finally:
+            self._session = None
+
+    async def call(self, tool_name: str, tool_args: dict):
+        """Calls one tool over the open session."""
+        return await self._session.call_tool(tool_name, tool_args)
+
+    async def aclose(self):
+        """Ends the session and stops the server process."""
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+
+
+# Sessions opened per MCP server. Tool handlers in the servers are synchronous, so
+# one session serves one call at a time; a few sessions let independent calls overlap.
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", 4))
+
+
+class MCPSessionPool:
+    """
+    A fixed set of open sessions to one MCP server.
+
+    Each call checks out an idle session and returns it when done, so independent
+    calls to the same server don't queue behind each other. A session found closed
+    at checkout is reopened in place.
+    """
+
+    def __init__(self, server_name: str, use_docker: bool, pool_size: int):
+        self.server_name = server_name
+        self.use_docker = use_docker
+        self.pool_size = pool_size
+        self._server_params: StdioServerParameters | None = None
+        self._idle: asyncio.Queue[MCPConnection] = asyncio.Queue()
+        self._conns: list[MCPConnection] = []
+
+    async def start(self):
+        """Opens all sessions concurrently. Fails only if none of them opens."""
+        self._server_params = await _server_params(self.server_name, self.use_docker)
+        self._conns = [
+            MCPConnection(self.server_name, self._server_params)
+            for _ in range(self.pool_size)
+        ]
+        results = await asyncio.gather(
+            *(conn.start() for conn in self._conns), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        for conn in self._conns:
+            self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[MCPConnection]:
+        """Checks out an open session for the duration of the block."""
+        conn = await self._idle.get()
+        try:
+            if not conn.is_open:
+                await conn.aclose()
+                self._server_params = await _server_params(
+                    self.server_name, self.use_docker
+                )
+                fresh = MCPConnection(self.server_name, self._server_params)
+                self._conns[self._conns.index(conn)] = fresh
+                conn = fresh
+                await conn.start()
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def aclose(self):
+        """Ends every session in the pool."""
+        for conn in self._conns:
+            await conn.aclose()
+
+
+# Session pools, keyed by (server_name, use_docker)
+_pools: dict[tuple[str, bool], MCPSessionPool] = {}
+_pools_lock = asyncio.Lock()
+
+
+async def get_pool(
+    server_name: str = "calendar", use_docker: bool = True
+) -> MCPSessionPool:
+    """Returns the session pool for server_name, opening it on first use."""
+    key = (server_name, use_docker)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    async with _pools_lock:
+        # Another caller may have opened it while we waited for the lock
+        pool = _pools.get(key)
+        if pool is not None:
+            return pool
+
+        pool = MCPSessionPool(server_name, use_docker, MCP_POOL_SIZE)
+        await pool.start()
+        _pools[key] = pool
+        return pool
+
+
+# MCP server behind each agent function tool, for prewarming
+_TOOL_SERVERS = {
+    "list_events_tool": "calendar",
+    "create_event_tool": "calendar",
+    "create_meeting_tool": "google-meet",
+    "list_meetings_tool": "google-meet",
+    "get_meeting_tool": "google-meet",
+    "update_meeting_tool": "google-meet",
+    "delete_meeting_tool": "google-meet",
+}
+
+# Strong references to running prewarm tasks, so they aren't collected mid-flight
+_prewarm_tasks: set[asyncio.Task] = set()
+
+
+def on_tool_call_start(tool_name: str):
+    """Starts connecting to the tool's MCP server as soon as the model names the tool.
+
+    Called from the stream formatter when a function call item is added, so the
+    session handshake overlaps the model streaming the call arguments. Never raises.
+    """
+    server_name = _TOOL_SERVERS.get(tool_name)
+    if server_name is None:
+        return
+    if (server_name, True) in _pools:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Formatting outside the server; there is no stream to overlap with
+        return
+
+    task = loop.create_task(get_pool(server_name))
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_done)
+
+
+def _prewarm_done(task: asyncio.Task):
+    _prewarm_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # The tool call itself will retry and report the error
+        logger.warning(f"MCP prewarm failed: {task.exception()}")
+
+
+async def aclose_all():
+    """Closes every open MCP session. Wired to the app's shutdown event."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.aclose()
 
 
 async def call_mcp_tool(
@@ -26,75 +274,61 @@ async def call_mcp_tool(
         use_docker: If True, connects to Docker container. If False, runs local script.
         server_name: Name of the MCP server to connect to ("calendar" or "google-meet")
     """
-    logger = logging.getLogger(__name__)
     logger.info(
         f"🔧 Calling MCP tool: {tool_name} with args: {tool_args} on server: {server_name}"
     )
 
-    # Server configuration mapping
-    server_configs = {
-        "calendar": {
-            "container_name": os.getenv("MCP_CONTAINER_NAME", "calendar-mcp"),
-            "command": ["python", "/app/run_mcp_stdio.py"],
-            "local_path": "calendar-mcp/run_mcp_stdio.py",
-            "setup_instructions": "cd backend/calendar-mcp && make up",
-        },
-        "google-meet": {
-            "container_name": os.getenv("GOOGLE_MEET_MCP_CONTAINER", "google-meet-mcp"),
-            "command": ["node", "src/index.js"],
-            "local_path": None,  # No local fallback for Node server
-            "setup_instructions": "cd google-meet-mcp-server && make up",
-        },
-    }
-
-    if server_name not in server_configs:
-        raise ValueError(
-            f"Unknown server name: {server_name}. Available: {list(server_configs.keys())}"
-        )
+    try:
+        pool = await get_pool(server_name, use_docker)
+
+        # Call the tool
+        logger.info(f"🔍 Calling {tool_name} tool")
+        async with pool.acquire() as conn:
+            result = await conn.call(tool_name, tool_args)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"✅ MCP call successful, got result: {_bounded_str(result)}...")
+        return result
+    except Exception as e:
+        logger.error(f"❌ Error calling MCP server: {e}", exc_info=True)
+        raise
+
+
+def _bounded_str(result, limit: int = 200) -> str:
+    """A preview of a tool result for logging.
+
+    Reads the start of the first text content block, so a large result (e.g. a long
+    find_events listing) is never stringified in full just to be truncated.
+    """
+    content = getattr(result, "content", None)
+    if content:
+        text = getattr(content[0], "text", None)
+        if isinstance(text, str):
+            return text[:limit]
+    return str(result)[:limit]
 
-    server_config = server_configs[server_name]
+
+async def _server_params(
+    server_name: str, use_docker: bool
+) -> StdioServerParameters:
+    """Returns the stdio launch parameters for server_name, checking its container is up."""
+    try:
+        server_config = _SERVER_CONFIGS[server_name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown server name: {server_name}. Available: {list(_SERVER_CONFIGS.keys())}"
+        ) from None
 
     if use_docker:
         # Connect to the MCP server running in Docker container
         logger.info(f"🐳 Connecting to {server_name} MCP server in Docker container")
 
-        container_name = server_config["container_name"]
-        command_args = server_config["command"]
-
-        server_params = StdioServerParameters(
-            command="docker",
-            args=["exec", "-i", container_name] + command_args,
-            env=None,
-        )
-
-        logger.debug(
-            f"MCP command: docker exec -i {container_name} {' '.join(command_args)}"
-        )
+        server_params = _docker_params(server_name)
+        logger.debug(f"MCP command: docker {' '.join(server_params.args)}")
 
         # Check if container is running
-        try:
-            result = subprocess.run(
-                [
-                    "docker",
-                    "ps",
-                    "--filter",
-                    f"name={container_name}",
-                    "--format",
-                    "{{.Names}}",
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            if container_name not in result.stdout:
-                raise RuntimeError(
-                    f"Docker container '{container_name}' is not running. "
-                    f"Start it with: {server_config['setup_instructions']}"
-                )
-            logger.info(f"✅ Container '{container_name}' is running")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to check Docker container status: {e}")
-            raise RuntimeError("Docker is not available or not running")
+        await _ensure_container_running(
+            server_config["container_name"], server_config["setup_instructions"]
+        )
 
     else:
         # Fallback to local script execution
@@ -106,35 +340,61 @@ async def call_mcp_tool(
                 f"Please use Docker: {server_config['setup_instructions']}"
             )
 
-        backend_dir = Path(__file__).parent
-        mcp_server_path = backend_dir / server_config["local_path"]
-
-        import sys
+        mcp_server_path = _BACKEND_DIR / server_config["local_path"]
 
-        python_executable = sys.executable
+        from mcp import StdioServerParameters
 
         server_params = StdioServerParameters(
-            command=python_executable, args=[str(mcp_server_path)], env=None
+            command=sys.executable, args=[str(mcp_server_path)], env=None
         )
 
-        logger.debug(f"MCP command: {python_executable} {mcp_server_path}")
+        logger.debug(f"MCP command: {sys.executable} {mcp_server_path}")
 
-    try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                logger.info("📡 MCP session established")
+    return server_params
 
-                # Initialize the session
-                await session.initialize()
-                logger.info("✅ MCP session initialized successfully")
 
-                # Call the tool
-                logger.info(f"🔍 Calling {tool_name} tool")
-                result = await session.call_tool(tool_name, tool_args)
-                logger.info(
-                    f"✅ MCP call successful, got result: {str(result)[:200]}..."
-                )
-                return result
-    except Exception as e:
-        logger.error(f"❌ Error calling MCP server: {e}", exc_info=True)
-        raise
+# Last docker ps result per container: (time.monotonic() of the check, was running)
+_container_status_cache: dict[str, tuple[float, bool]] = {}
+
+
+async def _ensure_container_running(
+    container_name: str, setup_instructions: str, ttl: float = 30.0
+):
+    """Raises RuntimeError unless container_name is running.
+
+    A positive result is reused for ttl seconds. The check runs docker ps as an async
+    subprocess so it never blocks the event loop.
+    """
+    cached = _container_status_cache.get(container_name)
+    if cached is not None and cached[1] and time.monotonic() - cached[0] < ttl:
+        return
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "docker",
+            "ps",
+            "--filter",
+            f"name={container_name}",
+            "--format",
+            "{{.Names}}",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+    except OSError as e:
+        logger.error(f"Failed to check Docker container status: {e}")
+        raise RuntimeError("Docker is not available or not running")
+    if proc.returncode != 0:
+        logger.error(
+            f"Failed to check Docker container status: {stderr.decode().strip()}"
+        )
+        raise RuntimeError("Docker is not available or not running")
+
+    running = container_name in stdout.decode()
+    _container_status_cache[container_name] = (time.monotonic(), running)
+    if not running:
+        raise RuntimeError(
+            f"Docker container '{container_name}' is not running. "
+            f"Start it with: {setup_instructions}"
+        )
+    logger.info(f"✅ Container '{container_name}' is running")
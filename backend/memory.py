@@ -2,22 +2,130 @@
 Memory storage and retrieval for the agent system.
 """
 
-memory = []
+import re
+import threading
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Optional
+
+# Oldest entries are dropped once the store is full, so memory use stays bounded
+MEMORY_MAX_ENTRIES = 10_000
+
+# Reciprocal rank fusion constant; 60 is the usual choice
+_RRF_K = 60
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# The store is kept as parallel columns rather than one dict per entry, so a source
+# filter scans a flat sequence of strings. Entry i is (sources[i], contents[i]).
+sources: deque[str] = deque(maxlen=MEMORY_MAX_ENTRIES)
+contents: deque[str] = deque(maxlen=MEMORY_MAX_ENTRIES)
+
+# Bumped on every store; part of the retrieval cache key, so cached results never
+# outlive the store contents they were computed from
+memory_version = 0
+
+# Inverted index from lowercased token to the ids of the entries containing it. An
+# entry's id is its store sequence number; the oldest live entry is at index 0.
+_postings: defaultdict[str, set[int]] = defaultdict(set)
+_next_id = 0
+
+# store_memory runs on the event loop, retrieval in a worker thread
+_lock = threading.Lock()
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
 
 
 def store_memory(source: str, content: str):
     """Store a memory entry with source and content."""
-    memory.append({"source": source, "content": content})
+    global memory_version, _next_id
+    with _lock:
+        if len(contents) == MEMORY_MAX_ENTRIES:
+            # The append below evicts entry 0; drop it from the index first
+            evicted_id = _next_id - MEMORY_MAX_ENTRIES
+            for token in _tokens(contents[0]):
+                posting = _postings[token]
+                posting.discard(evicted_id)
+                if not posting:
+                    del _postings[token]
 
+        sources.append(source)
+        contents.append(content)
+        for token in _tokens(content):
+            _postings[token].add(_next_id)
+        _next_id += 1
+        memory_version += 1
 
-def retrieve_memory(query: str, top_k: int = 3):
-    """Retrieve the most recent memory entries.
+
+def retrieve_memory(query: str, top_k: int = 3, source_filter: Optional[str] = None):
+    """Retrieve the memory entries most relevant to query.
+
+    Recency and keyword overlap with the query are ranked separately and fused with
+    reciprocal rank fusion, so exact identifiers (event IDs, emails, titles) surface
+    even when they are not among the newest entries. Without keyword matches this is
+    simply the most recent entries.
 
     Args:
-        query: Query string (currently unused, returns recent entries)
-        top_k: Number of recent entries to return
+        query: Query string matched against entry contents
+        top_k: Number of entries to return
+        source_filter: If given, only entries stored with this source are considered
 
     Returns:
-        List of recent memory entries
+        List of memory entries, oldest first
     """
-    return memory[-top_k:]
+    return list(_retrieve_cached(query, top_k, source_filter, memory_version))
+
+
+@lru_cache(maxsize=1024)
+def _retrieve_cached(
+    query: str, top_k: int, source_filter: Optional[str], version: int
+) -> tuple:
+    if top_k <= 0:
+        return ()
+    depth = 3 * top_k
+
+    with _lock:
+        first_id = _next_id - len(contents)
+
+        # Newest first
+        if source_filter is None:
+            by_recency = range(_next_id - 1, max(first_id, _next_id - depth) - 1, -1)
+        else:
+            by_recency = []
+            for index in range(len(sources) - 1, -1, -1):
+                if sources[index] == source_filter:
+                    by_recency.append(first_id + index)
+                    if len(by_recency) == depth:
+                        break
+
+        # Rarer tokens weigh more: each matched token scores 1 / (entries containing it)
+        keyword_scores: defaultdict[int, float] = defaultdict(float)
+        for token in _tokens(query or ""):
+            posting = _postings.get(token)
+            if posting:
+                weight = 1.0 / len(posting)
+                for entry_id in posting:
+                    keyword_scores[entry_id] += weight
+        if source_filter is not None:
+            keyword_scores = {
+                entry_id: score
+                for entry_id, score in keyword_scores.items()
+                if sources[entry_id - first_id] == source_filter
+            }
+        by_keyword = sorted(
+            keyword_scores, key=lambda i: (keyword_scores[i], i), reverse=True
+        )[:depth]
+
+        fused: defaultdict[int, float] = defaultdict(float)
+        for ranking in (by_recency, by_keyword):
+            for rank, entry_id in enumerate(ranking):
+                fused[entry_id] += 1.0 / (_RRF_K + rank)
+
+        best = sorted(fused, key=lambda i: (fused[i], i), reverse=True)[:top_k]
+        best.sort()
+        return tuple(
+            {"source": sources[index], "content": contents[index]}
+            for index in (entry_id - first_id for entry_id in best)
+        )
@@ -4,16 +4,20 @@ Streaming package for the agent system.
 
 from streaming.formatters import (
     format_stream_event,
+    format_stream_event_bytes,
     format_raw_response_event,
     format_run_item_event,
     format_agent_updated_event,
 )
+from streaming.batcher import EventBatcher
 from streaming.utils import extract_usage_info
 
 __all__ = [
     "format_stream_event",
+    "format_stream_event_bytes",
     "format_raw_response_event",
     "format_run_item_event",
     "format_agent_updated_event",
     "extract_usage_info",
+    "EventBatcher",
 ]
@@ -0,0 +1,95 @@
+"""
+Event batching for the agent stream.
+"""
+
+import asyncio
+from typing import AsyncIterator, Callable, Optional
+
+# Queued by the producer after the last frame
+_END = object()
+
+
+class EventBatcher:
+    """Groups consecutive SSE frames into fewer, larger writes.
+
+    Frames are buffered until max_events frames or max_bytes are pending, or no new
+    frame has arrived for max_delay_ms, then written out as one chunk. Frames matching
+    bypass (text deltas) are never held back: they flush whatever is pending along
+    with themselves, so streamed text reaches the client immediately and in order.
+
+    The frames stay ordinary SSE frames; a client reads a batch exactly as it would
+    the same frames sent one by one.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 16,
+        max_bytes: int = 16 * 1024,
+        max_delay_ms: float = 5,
+        bypass: Optional[Callable[[bytes], bool]] = None,
+    ):
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay_ms / 1000
+        self.bypass = bypass
+
+    async def batch(self, frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Yields the frames of frames, batched."""
+        # frames is iterated by one producer task, so every step of the source runs in
+        # the same task and context: context variables it sets (the Agents SDK keeps
+        # its current trace and span in them) carry over from one step to the next.
+        # The producer runs at most max_events frames ahead of the writes.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_events)
+        error: Optional[BaseException] = None
+
+        async def produce():
+            nonlocal error
+            try:
+                async for frame in frames:
+                    await queue.put(frame)
+            except Exception as exc:
+                error = exc
+            await queue.put(_END)
+
+        producer = asyncio.create_task(produce())
+        bypass = self.bypass
+        buffer = bytearray()
+        count = 0
+        try:
+            while True:
+                if count:
+                    try:
+                        frame = await asyncio.wait_for(queue.get(), self.max_delay)
+                    except asyncio.TimeoutError:
+                        yield bytes(buffer)
+                        buffer.clear()
+                        count = 0
+                        continue
+                else:
+                    frame = await queue.get()
+                if frame is _END:
+                    break
+
+                if bypass is not None and bypass(frame):
+                    if count:
+                        buffer += frame
+                        yield bytes(buffer)
+                        buffer.clear()
+                        count = 0
+                    else:
+                        yield frame
+                    continue
+
+                buffer += frame
+                count += 1
+                if count >= self.max_events or len(buffer) >= self.max_bytes:
+                    yield bytes(buffer)
+                    buffer.clear()
+                    count = 0
+            if count:
+                yield bytes(buffer)
+            if error is not None:
+                raise error
+        finally:
+            if not producer.done():
+                producer.cancel()
@@ -3,13 +3,60 @@ Stream event formatters for the agent system.
 """
 
 import logging
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+import orjson
 from agents.stream_events import StreamEvent
+from mcp_client import on_tool_call_start
 
+logger = logging.getLogger(__name__)
 
-def format_stream_event(
-    event: StreamEvent, logger: logging.Logger
-) -> Optional[dict[str, Any]]:
+
+# Event type inferred per event class, for events without a type attribute
+_CLASS_TYPE_CACHE: dict[type, Optional[str]] = {}
+
+
+def _infer_event_type(event_class: type) -> Optional[str]:
+    """Infers the event type from the class name, once per class."""
+    try:
+        return _CLASS_TYPE_CACHE[event_class]
+    except KeyError:
+        pass
+
+    # Check the actual class name as fallback
+    event_class_name = event_class.__name__
+    logger.warning(f"Event has no type attribute, class: {event_class_name}")
+    event_type = None
+    if "RawResponse" in event_class_name:
+        event_type = "raw_response_event"
+    elif "RunItem" in event_class_name:
+        event_type = "run_item_stream_event"
+    elif "AgentUpdated" in event_class_name:
+        event_type = "agent_updated_stream_event"
+
+    _CLASS_TYPE_CACHE[event_class] = event_type
+    return event_type
+
+
+def _tool_output_text(output: Any) -> Any:
+    """A JSON-safe form of a tool result.
+
+    The function tools return the MCP CallToolResult as is, which orjson cannot
+    encode; its text content blocks are sent instead, and any other object as str().
+    """
+    if output is None or isinstance(output, (str, int, float, bool)):
+        return output
+    content = getattr(output, "content", None)
+    if isinstance(content, list):
+        texts = [
+            text for text in (getattr(block, "text", None) for block in content)
+            if isinstance(text, str)
+        ]
+        if texts:
+            return "\n".join(texts)
+    return str(output)
+
+
+def format_stream_event(event: StreamEvent) -> Optional[dict[str, Any]]:
     """
     Format stream events into a consistent, frontend-friendly structure.
 
@@ -17,35 +64,18 @@ def format_stream_event(
     Uses event.type to check event types as per OpenAI Agents SDK documentation.
     """
     try:
-        # Safely access event.type - handle Union type issues
-        event_type = None
-        try:
-            # Try direct attribute access first
-            if hasattr(event, "type"):
-                event_type = event.type
-        except (AttributeError, TypeError) as e:
-            # If direct access fails, try getattr
-            logger.debug(f"Direct access failed, using getattr: {e}")
-            event_type = getattr(event, "type", None)
-
-        # If we still don't have a type, try to infer from the event object itself
+        event_type = getattr(event, "type", None)
+
+        # If we don't have a type, infer it from the event class
         if event_type is None:
-            # Check the actual class name as fallback
-            event_class_name = type(event).__name__
-            logger.warning(f"Event has no type attribute, class: {event_class_name}")
-            if "RawResponse" in event_class_name:
-                event_type = "raw_response_event"
-            elif "RunItem" in event_class_name:
-                event_type = "run_item_stream_event"
-            elif "AgentUpdated" in event_class_name:
-                event_type = "agent_updated_stream_event"
+            event_type = _infer_event_type(type(event))
 
         if event_type == "raw_response_event":
-            formatted_event = format_raw_response_event(event, logger)
+            formatted_event = format_raw_response_event(event)
         elif event_type == "run_item_stream_event":
-            formatted_event = format_run_item_event(event, logger)
+            formatted_event = format_run_item_event(event)
         elif event_type == "agent_updated_stream_event":
-            formatted_event = format_agent_updated_event(event, logger)
+            formatted_event = format_agent_updated_event(event)
         else:
             # Fallback for unknown event types - try to serialize what we can
             logger.warning(
@@ -59,7 +89,12 @@ def format_stream_event(
 
         return formatted_event
     except Exception as e:
-        logger.error(f"Error formatting event: {e}", exc_info=True)
+        # Tracebacks are only formatted with debug logging on; these paths can fire
+        # once per streamed event
+        logger.error(
+            f"Error formatting event: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
         # Return a minimal error event so frontend knows something happened
         return {
             "type": "error",
@@ -68,30 +103,198 @@ def format_stream_event(
         }
 
 
-def format_raw_response_event(
-    event: StreamEvent, logger: logging.Logger
-) -> dict[str, Any]:
-    """Format raw response events with proper JSON structure."""
+# --- Raw response event handlers ---
+# Each adds the fields specific to one raw event type to the base event. Looked up by
+# event type in _RAW_HANDLERS, so a text delta costs one dict lookup.
+
+
+# Delta events are well-typed SDK objects, so their fields are read directly; the
+# getattr-with-default reads are only the fallback for an unexpected shape.
+
+
+def _fill_text_delta(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Text streaming events
     try:
-        # Safely access event.data - handle Union type issues
-        event_data = None
-        try:
-            if hasattr(event, "data"):
-                event_data = event.data
-        except (AttributeError, TypeError):
-            event_data = getattr(event, "data", None)
+        base_event["delta"] = event_data.delta
+        base_event["content_index"] = event_data.content_index
+        base_event["item_id"] = event_data.item_id
+        base_event["output_index"] = event_data.output_index
+    except AttributeError:
+        base_event.update(
+            {
+                "delta": getattr(event_data, "delta", ""),
+                "content_index": getattr(event_data, "content_index", 0),
+                "item_id": getattr(event_data, "item_id", None),
+                "output_index": getattr(event_data, "output_index", 0),
+            }
+        )
+
 
+def _fill_reasoning_delta(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Reasoning events (for models like deepseek-reasoner)
+    try:
+        base_event["delta"] = event_data.delta
+    except AttributeError:
+        base_event["delta"] = ""
+    base_event["reasoning"] = True
+
+
+def _fill_refusal_delta(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Refusal events
+    try:
+        base_event["delta"] = event_data.delta
+    except AttributeError:
+        base_event["delta"] = ""
+    base_event["refusal"] = True
+
+
+def _fill_output_item_added(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Capture tool name when tool call starts
+    _fill_output_item_done(event_data, base_event)
+
+    # Extract tool name if this is a function tool call
+    item_obj = getattr(event_data, "item", None)
+    if item_obj and hasattr(item_obj, "name"):
+        base_event.update(
+            {
+                "tool_name": item_obj.name,
+                "call_id": getattr(item_obj, "call_id", None),
+            }
+        )
+        # Connect to the tool's MCP server while its arguments are still streaming
+        on_tool_call_start(item_obj.name)
+
+
+def _fill_output_item_done(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Output item events
+    item_obj = getattr(event_data, "item", None)
+    base_event.update(
+        {
+            "output_index": getattr(event_data, "output_index", 0),
+            "item_type": getattr(item_obj, "type", None) if item_obj else None,
+        }
+    )
+
+
+def _fill_function_call_delta(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Function call arguments
+    try:
+        base_event["delta"] = event_data.delta
+    except AttributeError:
+        base_event["delta"] = ""
+    base_event["function_call"] = True
+    # Not every variant of this event carries a call_id
+    base_event["call_id"] = getattr(event_data, "call_id", None)
+
+
+def _fill_response_lifecycle(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Response lifecycle events
+    response_obj = getattr(event_data, "response", None)
+    base_event.update(
+        {
+            "response_id": getattr(response_obj, "id", None) if response_obj else None,
+            "status": getattr(response_obj, "status", None) if response_obj else None,
+        }
+    )
+
+
+def _fill_content_part(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Content lifecycle events
+    base_event.update(
+        {
+            "content_index": getattr(event_data, "content_index", 0),
+            "item_id": getattr(event_data, "item_id", None),
+        }
+    )
+
+
+def _fill_text_done(event_data: Any, base_event: dict[str, Any]) -> None:
+    # Text completion events
+    base_event.update(
+        {
+            "text": getattr(event_data, "text", ""),
+            "content_index": getattr(event_data, "content_index", 0),
+            "item_id": getattr(event_data, "item_id", None),
+        }
+    )
+
+
+_RAW_HANDLERS: dict[str, Callable[[Any, dict[str, Any]], None]] = {
+    "response.output_text.delta": _fill_text_delta,
+    "response.function_call_arguments.delta": _fill_function_call_delta,
+    "response.reasoning_summary_text.delta": _fill_reasoning_delta,
+    "response.refusal.delta": _fill_refusal_delta,
+    "response.output_item.added": _fill_output_item_added,
+    "response.output_item.done": _fill_output_item_done,
+    "response.created": _fill_response_lifecycle,
+    "response.completed": _fill_response_lifecycle,
+    "response.content_part.added": _fill_content_part,
+    "response.content_part.done": _fill_content_part,
+    "response.output_text.done": _fill_text_done,
+}
+
+
+# Every encoded text delta starts with these bytes (the template's first two keys)
+TEXT_DELTA_PREFIX = b'{"type":"raw_response","event_type":"response.output_text.delta",'
+
+# Reused for every text delta, the bulk of a streamed response. Safe because it is
+# filled and serialized in one synchronous call, with no await in between.
+_TEXT_DELTA_TEMPLATE: dict[str, Any] = {
+    "type": "raw_response",
+    "event_type": "response.output_text.delta",
+    "sequence_number": None,
+    "delta": "",
+    "content_index": 0,
+    "item_id": None,
+    "output_index": 0,
+}
+
+
+def _text_delta_bytes(event_data: Any) -> bytes:
+    """Serializes a text delta through the shared template, with no per-event dict."""
+    template = _TEXT_DELTA_TEMPLATE
+    try:
+        template["sequence_number"] = event_data.sequence_number
+        template["delta"] = event_data.delta
+        template["content_index"] = event_data.content_index
+        template["item_id"] = event_data.item_id
+        template["output_index"] = event_data.output_index
+    except AttributeError:
+        template["sequence_number"] = getattr(event_data, "sequence_number", None)
+        template["delta"] = getattr(event_data, "delta", "")
+        template["content_index"] = getattr(event_data, "content_index", 0)
+        template["item_id"] = getattr(event_data, "item_id", None)
+        template["output_index"] = getattr(event_data, "output_index", 0)
+    return orjson.dumps(template)
+
+
+def format_stream_event_bytes(event: StreamEvent) -> Optional[bytes]:
+    """
+    Format a stream event and encode it as JSON bytes, ready for an SSE frame.
+
+    Text deltas take a fast path that skips building a dict; every other event is
+    formatted by format_stream_event and encoded with orjson.
+    """
+    if getattr(event, "type", None) == "raw_response_event":
+        event_data = getattr(event, "data", None)
+        if getattr(event_data, "type", None) == "response.output_text.delta":
+            return _text_delta_bytes(event_data)
+
+    formatted_event = format_stream_event(event)
+    if not formatted_event:
+        return None
+    return orjson.dumps(formatted_event, option=orjson.OPT_NON_STR_KEYS)
+
+
+def format_raw_response_event(event: StreamEvent) -> dict[str, Any]:
+    """Format raw response events with proper JSON structure."""
+    try:
+        event_data = getattr(event, "data", None)
         if event_data is None:
             logger.warning("Raw response event has no data attribute")
             return {"type": "raw_response", "error": "No data in event"}
 
-        # Safely get event_type from event_data
-        event_type = None
-        try:
-            if hasattr(event_data, "type"):
-                event_type = event_data.type
-        except (AttributeError, TypeError):
-            event_type = getattr(event_data, "type", "unknown")
+        event_type = getattr(event_data, "type", None)
 
         base_event = {
             "type": "raw_response",
@@ -100,119 +303,20 @@ def format_raw_response_event(
         }
 
         # Handle specific raw event types
-        if event_type:
-            # Text streaming events
-            if event_type == "response.output_text.delta":
-                base_event.update(
-                    {
-                        "delta": getattr(event_data, "delta", ""),
-                        "content_index": getattr(event_data, "content_index", 0),
-                        "item_id": getattr(event_data, "item_id", None),
-                        "output_index": getattr(event_data, "output_index", 0),
-                    }
-                )
-
-            # Reasoning events (for models like deepseek-reasoner)
-            elif event_type == "response.reasoning_summary_text.delta":
-                base_event.update(
-                    {"delta": getattr(event_data, "delta", ""), "reasoning": True}
-                )
-
-            # Refusal events
-            elif event_type == "response.refusal.delta":
-                base_event.update(
-                    {"delta": getattr(event_data, "delta", ""), "refusal": True}
-                )
-
-            # Capture tool name when tool call starts
-            elif event_type == "response.output_item.added":
-                item_obj = getattr(event_data, "item", None)
-                base_event.update(
-                    {
-                        "output_index": getattr(event_data, "output_index", 0),
-                        "item_type": getattr(item_obj, "type", None)
-                        if item_obj
-                        else None,
-                    }
-                )
-
-                # Extract tool name if this is a function tool call
-                if item_obj and hasattr(item_obj, "name"):
-                    base_event.update(
-                        {
-                            "tool_name": item_obj.name,
-                            "call_id": getattr(item_obj, "call_id", None),
-                        }
-                    )
-
-            # Function call arguments
-            elif event_type == "response.function_call_arguments.delta":
-                base_event.update(
-                    {
-                        "delta": getattr(event_data, "delta", ""),
-                        "function_call": True,
-                        "call_id": getattr(event_data, "call_id", None),
-                    }
-                )
-
-            # Response lifecycle events
-            elif event_type in ["response.created", "response.completed"]:
-                response_obj = getattr(event_data, "response", None)
-                base_event.update(
-                    {
-                        "response_id": getattr(response_obj, "id", None)
-                        if response_obj
-                        else None,
-                        "status": getattr(response_obj, "status", None)
-                        if response_obj
-                        else None,
-                    }
-                )
-
-            # Content lifecycle events
-            elif event_type in [
-                "response.content_part.added",
-                "response.content_part.done",
-            ]:
-                base_event.update(
-                    {
-                        "content_index": getattr(event_data, "content_index", 0),
-                        "item_id": getattr(event_data, "item_id", None),
-                    }
-                )
-
-            # Output item events
-            elif event_type in [
-                "response.output_item.added",
-                "response.output_item.done",
-            ]:
-                item_obj = getattr(event_data, "item", None)
-                base_event.update(
-                    {
-                        "output_index": getattr(event_data, "output_index", 0),
-                        "item_type": getattr(item_obj, "type", None)
-                        if item_obj
-                        else None,
-                    }
-                )
-
-            # Text completion events
-            elif event_type == "response.output_text.done":
-                base_event.update(
-                    {
-                        "text": getattr(event_data, "text", ""),
-                        "content_index": getattr(event_data, "content_index", 0),
-                        "item_id": getattr(event_data, "item_id", None),
-                    }
-                )
+        fill = _RAW_HANDLERS.get(event_type)
+        if fill is not None:
+            fill(event_data, base_event)
 
         return base_event
     except Exception as e:
-        logger.error(f"Error formatting raw response event: {e}", exc_info=True)
+        logger.error(
+            f"Error formatting raw response event: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
         return {"type": "raw_response", "error": str(e)}
 
 
-def format_run_item_event(event: StreamEvent, logger: logging.Logger) -> dict[str, Any]:
+def format_run_item_event(event: StreamEvent) -> dict[str, Any]:
     """Format run item events (semantic agent events)."""
     try:
         # Safely access event attributes - handle Union type issues
@@ -260,7 +364,7 @@ def format_run_item_event(event: StreamEvent, logger: logging.Logger) -> dict[st
             base_event.update(
                 {
                     "tool_name": getattr(event_item, "name", None),
-                    "output": getattr(event_item, "output", None),
+                    "output": _tool_output_text(getattr(event_item, "output", None)),
                     "call_id": getattr(event_item, "id", None),
                 }
             )
@@ -299,19 +403,24 @@ def format_run_item_event(event: StreamEvent, logger: logging.Logger) -> dict[st
             base_event.update(
                 {
                     "server_name": getattr(event_item, "server_name", None),
-                    "tools": getattr(event_item, "tools", []),
+                    # Tool objects are not JSON serializable; their names are enough
+                    "tools": [
+                        getattr(tool, "name", None) or str(tool)
+                        for tool in getattr(event_item, "tools", None) or ()
+                    ],
                 }
             )
 
         return base_event
     except Exception as e:
-        logger.error(f"Error formatting run item event: {e}", exc_info=True)
+        logger.error(
+            f"Error formatting run item event: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
         return {"type": "run_item", "error": str(e)}
 
 
-def format_agent_updated_event(
-    event: StreamEvent, logger: logging.Logger
-) -> dict[str, Any]:
+def format_agent_updated_event(event: StreamEvent) -> dict[str, Any]:
     """Format agent updated events (handoffs)."""
     try:
         # Safely access new_agent attribute - handle Union type issues
@@ -339,5 +448,8 @@ def format_agent_updated_event(
             "handoffs_count": len(getattr(new_agent, "handoffs", [])),
         }
     except Exception as e:
-        logger.error(f"Error formatting agent updated event: {e}", exc_info=True)
+        logger.error(
+            f"Error formatting agent updated event: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
         return {"type": "agent_updated", "error": str(e)}
@@ -1,9 +1,14 @@
 import uvicorn
 import os
 import sys
+import atexit
 import logging
 import logging.config  # Import logging config
-import threading
+import logging.handlers
+import multiprocessing
+import queue
+import signal
+import stat
 from dotenv import load_dotenv
 
 # --- Centralized Logging Configuration ---
@@ -11,54 +16,175 @@ from dotenv import load_dotenv
 project_dir_for_log = os.path.dirname(os.path.abspath(__file__))
 log_file_path = os.path.join(project_dir_for_log, "calendar_mcp.log")
 
-# Define the logging configuration dictionary
-LOGGING_CONFIG = {
-    "version": 1,
-    "disable_existing_loggers": False,  # Let FastAPI/Uvicorn use this config
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        },
+
+class BufferedFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating log file handler that batches records in a 64 KB userspace buffer.
+
+    logging.FileHandler flushes after every record, one write syscall each. Here
+    records accumulate until the buffer fills; errors are flushed immediately so they
+    are on disk before a crash. logging.shutdown() flushes and closes the handler at
+    interpreter exit, and dictConfig does the same when it replaces it.
+
+    RotatingFileHandler.shouldRollover formats each record a second time and seeks,
+    which flushes the buffer; here the file size is checked every
+    ROLLOVER_CHECK_INTERVAL records instead.
+    """
+
+    ROLLOVER_CHECK_INTERVAL = 256
+
+    def __init__(
+        self,
+        filename,
+        mode="a",
+        maxBytes=0,
+        backupCount=0,
+        buffer_size=1 << 16,
+        encoding="utf-8",
+    ):
+        self.buffer_size = buffer_size
+        self._records_since_check = 0
+        super().__init__(filename, mode, maxBytes, backupCount, encoding=encoding)
+
+    def _open(self):
+        # Always appended to, so each buffer flush is one sequential write and writes
+        # from the HTTP and MCP processes never overwrite each other
+        fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return os.fdopen(
+            fd,
+            "w",
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        self._records_since_check += 1
+        if self._records_since_check < self.ROLLOVER_CHECK_INTERVAL:
+            return False
+        self._records_since_check = 0
+
+        if self.stream is None:
+            self.stream = self._open()
+        opened = os.fstat(self.stream.fileno())
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        if current is None or (current.st_dev, current.st_ino) != (
+            opened.st_dev,
+            opened.st_ino,
+        ):
+            # The other process rotated the file; follow it rather than rotate again
+            self.stream.close()
+            self.stream = self._open()
+            return False
+        return opened.st_size >= self.maxBytes
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _stdin_is_tty() -> bool:
+    """Only a character device can be a TTY, so pipes, files and sockets (the MCP
+    stdio case) are settled by fstat without the isatty ioctl."""
+    try:
+        if not stat.S_ISCHR(os.fstat(0).st_mode):
+            return False
+    except OSError:  # stdin closed
+        return False
+    return os.isatty(0)
+
+
+# Checked once; stdin does not change for the life of the process
+is_tty = _stdin_is_tty()
+
+# Root and uvicorn.error level. WARNING by default: every INFO record costs a format
+# and a write per handler on each request. Set LOG_LEVEL=INFO (or DEBUG) to see more.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+
+_LOG_HANDLERS = {
+    "default": {  # Console handler (HTTP mode only)
+        "formatter": "default",
+        "class": "logging.StreamHandler",
+        "stream": "ext://sys.stderr",
     },
-    "handlers": {
-        "default": {  # Console handler (used when not in MCP mode)
-            "formatter": "default",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stderr",
-        },
-        "file": {  # File handler (always used)
-            "formatter": "default",
-            "class": "logging.FileHandler",
-            "filename": log_file_path,  # Use absolute path
-            "mode": "a",  # Append mode
-        },
+    "file": {  # File handler (always used)
+        "formatter": "default",
+        "()": BufferedFileHandler,
+        "filename": log_file_path,  # Use absolute path
+        "mode": "a",  # Append mode
+        "maxBytes": 50 * 1024 * 1024,
+        "backupCount": 5,
     },
-    "loggers": {
-        "": {  # Root logger
-            "handlers": ["default", "file"],  # Start with both
-            "level": "INFO",
-        },
-        "uvicorn.error": {
-            "level": "INFO",  # Capture uvicorn errors
-            "handlers": ["default", "file"],
-            "propagate": False,
+}
+
+
+# Define the logging configuration dictionary
+def _build_logging_config(handlers):
+    # Only the handlers in use are listed; dictConfig builds every one it is given
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,  # Let FastAPI/Uvicorn use this config
+        "formatters": {
+            "default": {
+                # The record's own epoch timestamp, printed as is: %(asctime)s would
+                # cost a localtime() and strftime() per record
+                "format": "%(created).6f - %(name)s - %(levelname)s - %(message)s",
+            },
         },
-        "uvicorn.access": {
-            "level": "WARNING",  # Reduce access log noise if desired
-            "handlers": ["default", "file"],
-            "propagate": False,
+        "handlers": {name: _LOG_HANDLERS[name] for name in handlers},
+        "loggers": {
+            "": {  # Root logger
+                "handlers": handlers,
+                "level": LOG_LEVEL,
+            },
+            "uvicorn.error": {
+                "level": LOG_LEVEL,  # Capture uvicorn errors
+                "handlers": handlers,
+                "propagate": False,
+            },
+            "uvicorn.access": {
+                "level": "WARNING",  # Reduce access log noise if desired
+                "handlers": handlers,
+                "propagate": False,
+            },
         },
-    },
-}
+    }
+
+
+# stdout carries the MCP protocol and its stderr goes to the client, so an MCP
+# server logs to the file only; one format and one write per record. HTTP mode
+# also logs to the console.
+LOGGING_CONFIG_MCP = _build_logging_config(["file"])
+LOGGING_CONFIG_HTTP = _build_logging_config(["default", "file"])
+LOGGING_CONFIG = LOGGING_CONFIG_HTTP if is_tty else LOGGING_CONFIG_MCP
 
 # --- Force Reset Existing Handlers ---
 # Get the root logger
 root_logger_for_reset = logging.getLogger()
-# Remove all existing handlers
-if root_logger_for_reset.hasHandlers():
-    for handler in root_logger_for_reset.handlers[:]:  # Iterate over a copy
-        root_logger_for_reset.removeHandler(handler)
-        handler.close()  # Close the handler properly
+# Remove all existing handlers, under one acquisition of the logging lock
+if root_logger_for_reset.handlers:
+    with logging._lock:
+        for handler in root_logger_for_reset.handlers:
+            try:
+                handler.close()  # Close the handler properly
+            except Exception:
+                pass
+        root_logger_for_reset.handlers.clear()
     print(
         "Log Reset: Removed existing handlers."
     )  # Use print as logger not configured yet
@@ -67,27 +193,46 @@ if root_logger_for_reset.hasHandlers():
 # Apply the configuration
 logging.config.dictConfig(LOGGING_CONFIG)
 
+# --- Queue Log Output ---
+# Loggers only enqueue records; the console and file handlers run on one
+# QueueListener thread, so request threads never wait on handler locks or disk I/O.
+_queued_loggers = [
+    logging.getLogger(name) for name in ("", "uvicorn.error", "uvicorn.access")
+]
+log_listener = logging.handlers.QueueListener(
+    queue.SimpleQueue(),
+    *dict.fromkeys(h for lg in _queued_loggers for h in lg.handlers),
+    respect_handler_level=True,
+)
+_queue_handler = logging.handlers.QueueHandler(log_listener.queue)
+for queued_logger in _queued_loggers:
+    queued_logger.handlers = [_queue_handler]
+log_listener.start()
+# Registered after logging's own exit hook, so it runs first: the queue is drained
+# before the handlers are flushed and closed
+atexit.register(log_listener.stop)
+
+
+def _exit_on_sigterm(signum, frame):
+    # SIGTERM's default action kills the process without running atexit hooks, which
+    # would lose the records still queued or sitting in the file buffer
+    sys.exit(128 + signum)
+
+
+signal.signal(signal.SIGTERM, _exit_on_sigterm)
+# --- End Queue Log Output ---
+
 # Get the root logger AFTER configuration
 logger = logging.getLogger(__name__)
 logger.info(f"Logging configured. Log file path: {log_file_path}")  # Log the path
 # --- End Logging Configuration ---
 
 
-# Function to run the MCP server in a separate thread
+# Function to run the MCP server in a separate process
 def run_mcp_server():
-    # Remove ONLY the console/stream handler for the MCP thread to keep stdio clean
-    root_logger = logging.getLogger()
-    handler_to_remove = None
-    for handler in root_logger.handlers:
-        if isinstance(handler, logging.StreamHandler):
-            handler_to_remove = handler
-            break  # Found the console handler, stop looking
-
-    if handler_to_remove:
-        logger.info(f"MCP Mode: Removing console handler {handler_to_remove}")
-        root_logger.removeHandler(handler_to_remove)
-    else:
-        logger.warning("MCP Mode: Console handler (StreamHandler) not found to remove.")
+    # multiprocessing points the child's sys.stdin at /dev/null, but fd 0 is still
+    # the MCP client's pipe
+    sys.stdin = open(0, closefd=False)
 
     # Import and run MCP server
     from src.mcp_bridge import create_mcp_server
@@ -97,8 +242,7 @@ def run_mcp_server():
     try:
         mcp.run(transport="stdio")
     except Exception as e:
-        logger.error(f"MCP server thread failed: {e}", exc_info=True)
-        # Handle the error appropriately, maybe signal the main thread
+        logger.error(f"MCP server process failed: {e}", exc_info=True)
 
 
 if __name__ == "__main__":
@@ -118,18 +262,22 @@ if __name__ == "__main__":
     # Load environment variables
     load_dotenv()
 
-    # Start MCP server thread if stdin is not a TTY
-    if not os.isatty(0):
-        logger.info("MCP client detected via stdin: Starting MCP server thread")
-        mcp_thread = threading.Thread(target=run_mcp_server, daemon=True)
-        mcp_thread.start()
-        logger.info("MCP server thread launched")
+    # Start MCP server process if stdin is not a TTY. A separate process has its own
+    # GIL and logging locks, so MCP traffic never contends with the uvicorn loop.
+    # Spawned rather than forked: this process already runs the log listener thread,
+    # and the child sets up its own logging when it re-imports this module.
+    if not is_tty:
+        logger.info("MCP client detected via stdin: Starting MCP server process")
+        mcp_process = multiprocessing.get_context("spawn").Process(
+            target=run_mcp_server, daemon=True
+        )
+        mcp_process.start()
+        logger.info("MCP server process launched")
     else:
         logger.info("Running in HTTP-only mode (stdin is a TTY)")
         # Ensure console handler is present if we started in HTTP mode
-        root_logger = logging.getLogger()
         has_console = any(
-            isinstance(h, logging.StreamHandler) for h in root_logger.handlers
+            isinstance(h, logging.StreamHandler) for h in log_listener.handlers
         )
         if not has_console:
             logger.warning("Console handler missing in HTTP mode, adding default.")
@@ -137,25 +285,35 @@ if __name__ == "__main__":
             console_handler.setFormatter(
                 logging.Formatter(LOGGING_CONFIG["formatters"]["default"]["format"])
             )
-            root_logger.addHandler(console_handler)
+            log_listener.handlers += (console_handler,)
 
-    # FastAPI/Uvicorn settings
-    host = os.getenv("HOST", "127.0.0.1")
-    port = int(os.getenv("PORT", 8001))
-    reload = os.getenv("RELOAD", "true").lower() == "true"
+    # FastAPI/Uvicorn settings. Reload is for development and off unless asked for.
+    env = os.environ
+    host = env.get("HOST", "127.0.0.1")
+    port = int(env.get("PORT", "8001"))
+    reload = env.get("RELOAD", "false").lower() == "true"
 
     logger.info(f"Starting FastAPI server on {host}:{port}...")
     logger.info(f"Reload mode: {'Enabled' if reload else 'Disabled'}")
 
-    # Run Uvicorn, telling it to use our logging config
+    # Run Uvicorn with logging left as configured above. Passing LOGGING_CONFIG
+    # would make it re-apply the dict and swap the queue back for direct handlers; a
+    # reload worker re-runs this module's top level, so it is configured the same way.
     try:
-        uvicorn.run(
-            "src.server:app",
-            host=host,
-            port=port,
-            reload=reload,
-            log_config=LOGGING_CONFIG,  # Pass our config dict
-        )
+        if reload:
+            # The reloader needs an import string to re-import the app in its worker
+            uvicorn.run(
+                "src.server:app",
+                host=host,
+                port=port,
+                reload=True,
+                log_config=None,
+            )
+        else:
+            # Imported once here and handed over, rather than resolved by uvicorn
+            from src.server import app
+
+            uvicorn.run(app, host=host, port=port, log_config=None)
     except Exception as e:
         logger.error(f"Error starting FastAPI server: {e}", exc_info=True)
         sys.exit(1)
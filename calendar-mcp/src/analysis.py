@@ -1,10 +1,15 @@
+import heapq
 import logging
-from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
-from collections import defaultdict
+import re
+from datetime import datetime, date, timedelta, timezone, tzinfo
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 
 from google.oauth2.credentials import Credentials
-from dateutil import rrule
+from dateutil import rrule, tz as date_tz
 from dateutil import parser as date_parser # Alias to avoid confusion with our parser module if any
 
 # Import find_events from the sibling module
@@ -22,26 +27,450 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Matches the UNTIL part of an RRULE, e.g. 'UNTIL=20110701T170000Z' or 'UNTIL=20110701'
+UNTIL_RE = re.compile(r'UNTIL=(\d{8}(?:T\d{6}Z?)?)')
+# EXDATE lines as Google emits them, e.g. "EXDATE;TZID=Europe/Zurich:20110426T080000,20110428T080000"
+EXDATE_RE = re.compile(r'^EXDATE(?:;TZID=(?P<tzid>[^:;]+))?(?:;VALUE=(?P<value>DATE(?:-TIME)?))?:(?P<dates>.+)$')
+
+# --- Parsing Helpers ---
+# Identical timestamps (and offset suffixes) recur across events, so raw strings are memoized.
+# EventDateTime fields are already validated into datetime/date objects by Pydantic; those pass through.
+
+# Parsed offsets are fixed, so one shared timezone object per UTC offset (in minutes) is enough.
+# Offsets are bounded to +/-23:59, so the cache never exceeds 2879 entries.
+_TZ_CACHE: Dict[int, timezone] = {}
+
+def _canon_tz(dt: datetime) -> datetime:
+    """Swaps a datetime's fixed-offset tzinfo for the shared cached instance."""
+    offset = dt.utcoffset()
+    if offset is None:
+        return dt
+    key = int(offset.total_seconds()) // 60
+    cached = _TZ_CACHE.get(key)
+    if cached is None:
+        cached = _TZ_CACHE[key] = timezone(offset)
+    return dt if dt.tzinfo is cached else dt.replace(tzinfo=cached)
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    # fromisoformat is implemented in C and handles RFC3339 (including 'Z') on 3.11+;
+    # dateutil remains the fallback for the looser forms it accepts
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = date_parser.isoparse(value)
+    return _canon_tz(parsed)
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    # Calendar dates are strict 'YYYY-MM-DD' or iCalendar 'YYYYMMDD'; avoid the generic parser
+    if len(value) == 8 and value.isdigit():
+        return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return date_parser.parse(value).date()
+
+def _iso(value) -> datetime:
+    """Returns a datetime for an ISO-8601 string or an already-parsed datetime."""
+    return _canon_tz(value) if isinstance(value, datetime) else _parse_iso(value)
+
+def _date(value) -> date:
+    """Returns a date for a date string or an already-parsed date."""
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else _parse_date(value)
+
+@lru_cache(maxsize=2048)
+def _parse_rrule(rrule_str: str, dtstart_wall: datetime, tz: Optional[tzinfo]):
+    """Parses an RRULE string for a dtstart given as naive wall-clock time plus tzinfo.
+
+    The start is split so aware datetimes for the same instant in different zones
+    don't collide in the cache. Parsed rules are never mutated, so sharing is safe.
+    """
+    return rrule.rrulestr(rrule_str, dtstart=dtstart_wall.replace(tzinfo=tz))
+
+# Rules the arithmetic fast path can expand: step in days per FREQ, weekday codes for BYDAY
+_SIMPLE_FREQ_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+_WEEKDAY_CODES = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+@lru_cache(maxsize=2048)
+def _parse_simple_rrule(rrule_str: str) -> Optional[Tuple[int, Optional[int], Optional[str], Optional[str]]]:
+    """Parses a DAILY/WEEKLY RRULE that steps by a fixed number of days.
+
+    Only FREQ, INTERVAL, COUNT, UNTIL, WKST and a single BYDAY (WEEKLY only) are allowed.
+
+    Returns:
+        (step_days, count, until, byday), or None if the rule needs dateutil's full engine.
+    """
+    body = rrule_str[6:] if rrule_str.startswith('RRULE:') else rrule_str
+    parts: Dict[str, str] = {}
+    for part in body.split(';'):
+        key, sep, value = part.partition('=')
+        if not sep:
+            return None
+        parts[key.upper()] = value.upper()
+
+    freq_days = _SIMPLE_FREQ_DAYS.get(parts.pop('FREQ', ''))
+    if freq_days is None:
+        return None
+    try:
+        interval = int(parts.pop('INTERVAL', '1'))
+        count = int(parts.pop('COUNT')) if 'COUNT' in parts else None
+    except ValueError:
+        return None
+    until = parts.pop('UNTIL', None)
+    byday = parts.pop('BYDAY', None)
+    parts.pop('WKST', None) # Irrelevant when at most one weekday is selected
+    if parts or interval < 1:
+        return None
+    if byday is not None and (freq_days != 7 or byday not in _WEEKDAY_CODES):
+        return None
+    return freq_days * interval, count, until, byday
+
+def _project_simple(
+    dtstart: datetime,
+    rule: Tuple[int, Optional[int], Optional[str], Optional[str]],
+    window_start: datetime,
+    window_end: datetime,
+    exdates: Set[datetime]
+) -> Optional[List[datetime]]:
+    """Expands a fixed-step rule from _parse_simple_rrule within [window_start, window_end].
+
+    Jumps straight to the first occurrence in the window with integer arithmetic instead of
+    walking every occurrence since dtstart. Returns None if the rule must go through dateutil.
+    """
+    step_days, count, until_str, byday = rule
+    if byday is not None and byday != _WEEKDAY_CODES[dtstart.weekday()]:
+        return None
+    until = _iso(until_str) if until_str else None
+    if until is not None and (until.tzinfo is None) != (dtstart.tzinfo is None):
+        return None # Let dateutil apply its RFC 5545 handling of mismatched UNTIL
+
+    dtstart = dtstart.replace(microsecond=0) # Matches dateutil's dtstart normalization
+    step = timedelta(days=step_days)
+    # Start one step early so wall-clock vs absolute differences (DST) can't skip an occurrence
+    k = max(0, (window_start - dtstart) // step - 1)
+    occ = dtstart + k * step
+    while occ < window_start:
+        k += 1
+        occ = dtstart + k * step
+
+    occurrences: List[datetime] = []
+    while occ <= window_end and (count is None or k < count) and (until is None or occ <= until):
+        if occ not in exdates:
+            occurrences.append(occ)
+        k += 1
+        occ = dtstart + k * step
+    return occurrences
+
+def _ends_before(until: datetime, bound: datetime) -> bool:
+    """Returns True if a series' UNTIL lies before bound, comparing wall-clock time if only one is aware."""
+    if (until.tzinfo is None) != (bound.tzinfo is None):
+        return until.replace(tzinfo=None) < bound.replace(tzinfo=None)
+    return until < bound
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_ONE_SECOND = timedelta(seconds=1)
+
+def _to_epoch(dt: datetime) -> int:
+    """Whole seconds since the epoch; naive datetimes are counted as wall time."""
+    return (dt - (_EPOCH if dt.tzinfo is None else _EPOCH_UTC)) // _ONE_SECOND
+
+def _from_epoch(seconds: int, tz: Optional[tzinfo]) -> datetime:
+    """Inverse of _to_epoch for a datetime whose tzinfo was tz."""
+    if tz is None:
+        return _EPOCH + timedelta(seconds=seconds)
+    return datetime.fromtimestamp(seconds, tz)
+
 # Define a structure for projected occurrences (can be a TypedDict or Pydantic model later)
 class ProjectedEventOccurrence:
+    # Projections can produce thousands of instances; slots avoid a per-instance __dict__.
+    # Times are kept as epoch seconds plus one shared tzinfo reference and only become
+    # datetimes when read, so long projections hold ints rather than datetime objects.
+    __slots__ = ('original_event_id', 'original_summary', '_start_epoch', '_end_epoch', '_tz')
+
     def __init__(self, original_event_id: str, original_summary: str, occurrence_start: datetime, occurrence_end: datetime):
         self.original_event_id = original_event_id
         self.original_summary = original_summary
-        self.occurrence_start = occurrence_start
-        self.occurrence_end = occurrence_end
+        self._start_epoch = _to_epoch(occurrence_start)
+        self._end_epoch = _to_epoch(occurrence_end)
+        self._tz = occurrence_start.tzinfo
+
+    @property
+    def occurrence_start(self) -> datetime:
+        return _from_epoch(self._start_epoch, self._tz)
+
+    @property
+    def occurrence_end(self) -> datetime:
+        return _from_epoch(self._end_epoch, self._tz)
 
     def __repr__(self):
         return f"ProjectedOccurrence(id='{self.original_event_id}', summary='{self.original_summary}', start='{self.occurrence_start}', end='{self.occurrence_end}')"
 
 
-def project_recurring_events(
+# Sort on the stored epoch so ordering never materializes datetimes
+_OCCURRENCE_START = attrgetter('_start_epoch')
+
+
+def _project_one(event: Any, time_min: datetime, time_max: datetime) -> List[ProjectedEventOccurrence]:
+    """Projects the occurrences of a single master event within [time_min, time_max].
+
+    Returns an empty list for events that are not recurring or cannot be parsed.
+    """
+    projected: List[ProjectedEventOccurrence] = []
+
+    if not event.recurrence:
+        # logger.debug(f"Skipping non-recurring event: {event.summary} ({event.id})")
+        return [] # Skip non-recurring events
+
+    if not event.start or not (event.start.dateTime or event.start.date):
+         logger.warning(f"Skipping recurring event without start time: {event.summary} ({event.id})")
+         return []
+
+    # Determine the start datetime of the recurrence series (dtstart)
+    # Handle both date and dateTime cases
+    dtstart_obj: Optional[datetime] = None
+    event_duration: Optional[timedelta] = None
+
+    if event.start.dateTime:
+        try:
+            # Already a datetime after model validation; _iso only parses a raw string
+            dtstart_obj = _iso(event.start.dateTime)
+            if event.end and event.end.dateTime:
+                dtend_obj = _iso(event.end.dateTime)
+                event_duration = dtend_obj - dtstart_obj
+            else:
+                # Default duration for dateTime events if end is missing (e.g., 1 hour)
+                event_duration = timedelta(hours=1)
+                logger.warning(f"Recurring event '{event.summary}' missing end.dateTime, assuming {event_duration} duration.")
+        except ValueError as e:
+             logger.error(f"Could not parse dateTime for event {event.summary} ({event.id}): {e}")
+             return []
+    elif event.start.date:
+        try:
+            # All-day event - parse date and set time to midnight
+            start_date = _date(event.start.date)
+            # Make dtstart timezone-aware if time_min is, otherwise naive UTC
+            dtstart_obj = datetime.combine(start_date, datetime.min.time())
+            if time_min.tzinfo:
+                 # Try to use the target window's timezone, otherwise UTC fallback
+                 dtstart_obj = dtstart_obj.replace(tzinfo=time_min.tzinfo)
+            # else:
+                 # dtstart_obj = dtstart_obj.replace(tzinfo=timezone.utc) # Requires import
+
+            # Duration for all-day events is typically 1 day
+            if event.end and event.end.date:
+                end_date = _date(event.end.date)
+                event_duration = end_date - start_date # This includes the start day but excludes the end day
+            else:
+                event_duration = timedelta(days=1) # Assume single all-day event
+        except ValueError as e:
+             logger.error(f"Could not parse date for event {event.summary} ({event.id}): {e}")
+             return []
+
+    if not dtstart_obj or event_duration is None:
+         logger.error(f"Could not determine dtstart or duration for event {event.summary} ({event.id})")
+         return []
+
+    # Extract RRULE, EXDATE, RDATE strings
+    # Google Calendar API returns recurrence as a list of strings
+    # e.g., ['RRULE:FREQ=WEEKLY;UNTIL=20110701T170000Z', 'EXDATE:20110610T100000Z']
+    rrule_str: Optional[str] = None
+    exdate_strs: List[str] = []
+    rdate_strs: List[str] = []
+    # Dispatch each line once on its property name (text before the first ':' or ';')
+    buckets = {'EXDATE': exdate_strs, 'RDATE': rdate_strs}
+    for rule_str in event.recurrence:
+        name = rule_str.split(':', 1)[0].split(';', 1)[0]
+        if name == 'RRULE':
+            rrule_str = rule_str # Assume only one RRULE per event
+        else:
+            bucket = buckets.get(name)
+            if bucket is not None:
+                bucket.append(rule_str)
+
+    if not rrule_str:
+        logger.warning(f"Recurring event '{event.summary}' ({event.id}) has no RRULE string. Skipping.")
+        return []
+
+    # Series that ended before the window can't produce occurrences; skip them
+    # before paying for rule parsing and expansion
+    until_match = UNTIL_RE.search(rrule_str)
+    if until_match:
+        try:
+            if _ends_before(_iso(until_match.group(1)), time_min):
+                return []
+        except ValueError:
+            pass # Let rrulestr report the malformed rule below
+
+    try:
+        # Collect exception dates (EXDATE)
+        exdates: Set[datetime] = set()
+        for exdate_str in exdate_strs:
+            # EXDATE format: "EXDATE;TZID=Europe/Zurich:20110426T080000,20110428T080000"
+            # Or "EXDATE;VALUE=DATE:20240101" (all-day)
+            # Or "EXDATE:20240101T100000Z" (UTC)
+            # dateutil.rrule.rrulestr can parse EXDATE directly if part of the string,
+            # but Google separates them. We need to parse dates/datetimes manually.
+            exdate_match = EXDATE_RE.match(exdate_str)
+            if not exdate_match:
+                logger.warning(f"Could not parse EXDATE line '{exdate_str}' for event {event.id}")
+                continue
+
+            is_all_day = exdate_match.group('value') == 'DATE'
+            tz_id = exdate_match.group('tzid')
+            ex_tz = date_tz.gettz(tz_id) if tz_id else None
+
+            for date_str in exdate_match.group('dates').split(','):
+                try:
+                    if is_all_day:
+                        ex_date = _date(date_str)
+                        # Create datetime at midnight for comparison/ruleset
+                        ex_dt = datetime.combine(ex_date, datetime.min.time())
+                        if dtstart_obj.tzinfo: # Match tzinfo
+                            ex_dt = ex_dt.replace(tzinfo=dtstart_obj.tzinfo)
+                    else:
+                        ex_dt = _iso(date_str)
+                        if ex_dt.tzinfo is None and ex_tz is not None:
+                            # Local time in TZID; aware datetimes compare by instant
+                            ex_dt = ex_dt.replace(tzinfo=ex_tz)
+                        if (ex_dt.tzinfo is None) != (dtstart_obj.tzinfo is None):
+                            # Align with dtstart so the ruleset can compare them
+                            ex_dt = ex_dt.replace(tzinfo=dtstart_obj.tzinfo)
+
+                    exdates.add(ex_dt)
+                except ValueError:
+                    logger.warning(f"Could not parse EXDATE value '{date_str}' for event {event.id}")
+
+        # Add explicit recurrence dates (RDATE) - Less common?
+        # Similar parsing logic as EXDATE if needed.
+        # for rdate_str in rdate_strs: ... ruleset.rdate(...)
+
+        # Generate occurrences within the desired window [time_min, time_max]
+        # Fixed-step DAILY/WEEKLY rules (the common case) are expanded arithmetically;
+        # anything else goes through dateutil's rruleset.
+        occurrences: Optional[List[datetime]] = None
+        simple_rule = None if rdate_strs else _parse_simple_rrule(rrule_str)
+        if simple_rule is not None:
+            occurrences = _project_simple(dtstart_obj, simple_rule, time_min, time_max, exdates)
+        if occurrences is None:
+            ruleset = rrule.rruleset()
+            # Series sharing a rule and start reuse one parsed rule; tzinfo is canonical after _iso
+            ruleset.rrule(_parse_rrule(rrule_str, dtstart_obj.replace(tzinfo=None), dtstart_obj.tzinfo))
+            for ex_dt in exdates:
+                ruleset.exdate(ex_dt)
+            # Note: rruleset.between includes dates equal to dtstart/until
+            occurrences = ruleset.between(time_min, time_max, inc=True) # inc=True includes time_min
+
+        logger.debug(f"Event '{event.summary}' ({event.id}): Found {len(occurrences)} occurrences via rrule.")
+
+        # Ensure timezone consistency with dtstart. Every occurrence comes from the same
+        # rule, so they share awareness and one check decides for the whole list.
+        dtstart_tz = dtstart_obj.tzinfo
+        if occurrences and (occurrences[0].tzinfo is None) != (dtstart_tz is None):
+            occurrences = [occ.replace(tzinfo=dtstart_tz) for occ in occurrences]
+
+        # Loop-invariant lookups bound to locals for the hot loop
+        event_id = event.id
+        summary = event.summary or "No Summary"
+        append = projected.append
+        for occ_start_dt in occurrences:
+             # Double check if the occurrence actually overlaps the window
+             # ruleset.between should handle this, but an extra check might be useful
+             # if occ_start_dt < time_max and occ_start_dt + event_duration > time_min:
+             append(
+                  ProjectedEventOccurrence(
+                       original_event_id=event_id,
+                       original_summary=summary,
+                       occurrence_start=occ_start_dt,
+                       occurrence_end=occ_start_dt + event_duration
+                  )
+             )
+
+    except Exception as e:
+        logger.error(f"Failed to parse/process recurrence for event '{event.summary}' ({event.id}): {e}", exc_info=True)
+        return [] # Skip this event
+
+    return projected
+
+
+def _project_server_side(
     credentials: Credentials,
     time_min: datetime,
     time_max: datetime,
-    calendar_id: str = 'primary',
-    event_query: Optional[str] = None
+    calendar_id: str
 ) -> List[ProjectedEventOccurrence]:
-    """Finds recurring events and projects their occurrences within a time window.
+    """Projects recurring events using the API's own expansion (singleEvents=true).
+
+    Google expands every series server-side, honouring EXDATEs and moved or cancelled
+    instances, so no rule parsing happens locally. Only instances of recurring events
+    that start inside [time_min, time_max] are kept, matching the local projection.
+    """
+    pages = calendar_actions.iter_event_pages(
+        credentials=credentials,
+        calendar_id=calendar_id,
+        time_min=time_min,
+        time_max=time_max,
+        single_events=True,
+        showDeleted=False,
+        max_results=2500
+    )
+    projected: List[ProjectedEventOccurrence] = []
+    append = projected.append
+    for page in pages:
+        for instance in page.items:
+            series_id = instance.recurring_event_id
+            start = instance.start
+            if not series_id or not start:
+                continue # Not part of a recurring series
+            end = instance.end
+            try:
+                if start.dateTime:
+                    occ_start_dt = _iso(start.dateTime)
+                    occ_end_dt = _iso(end.dateTime) if end and end.dateTime else occ_start_dt + timedelta(hours=1)
+                elif start.date:
+                    # All-day instance: midnight in the window's timezone, as in _project_one
+                    occ_start_dt = datetime.combine(_date(start.date), datetime.min.time(), time_min.tzinfo)
+                    occ_end_dt = (datetime.combine(_date(end.date), datetime.min.time(), time_min.tzinfo)
+                                  if end and end.date else occ_start_dt + timedelta(days=1))
+                else:
+                    continue
+                # The API also returns instances that merely overlap the window start
+                if occ_start_dt < time_min or occ_start_dt > time_max:
+                    continue
+            except (ValueError, TypeError):
+                # Unparseable times, or a naive instance time that cannot be compared
+                # with the window; skip the instance rather than the whole projection
+                logger.warning(f"Could not parse start/end for instance {instance.id}")
+                continue
+            append(
+                ProjectedEventOccurrence(
+                    original_event_id=series_id,
+                    original_summary=instance.summary or "No Summary",
+                    occurrence_start=occ_start_dt,
+                    occurrence_end=occ_end_dt
+                )
+            )
+    return projected
+
+
+def iter_project_recurring_events(
+    credentials: Credentials,
+    time_min: datetime,
+    time_max: datetime,
+    calendar_id: str = 'primary',
+    event_query: Optional[str] = None,
+    calendar_ids: Optional[List[str]] = None,
+    max_workers: int = 1,
+    expand_on_server: bool = True
+) -> Iterator[ProjectedEventOccurrence]:
+    """Finds recurring events and yields their occurrences within a time window.
+
+    Occurrences are yielded in chronological order as the per-event results are
+    merged, so callers that only need a prefix (itertools.islice, an early break)
+    never build the full merged list.
 
     Args:
         credentials: Valid Google OAuth2 credentials.
@@ -49,198 +478,101 @@ def project_recurring_events(
         time_max: End of the projection window (timezone-aware recommended).
         calendar_id: The calendar to search within.
         event_query: Optional text query to filter master recurring events (e.g., "Birthday").
-
-    Returns:
-        A list of ProjectedEventOccurrence objects representing calculated occurrences.
+        calendar_ids: Optional list of calendars to search instead of calendar_id.
+            Master events for all of them are fetched in one batched request.
+        max_workers: Number of threads used to expand master events. Defaults to
+            serial expansion, which is fastest for pure-Python rules under the GIL.
+        expand_on_server: Let the API expand recurrences (singleEvents=true) when no
+            event_query or calendar_ids are given. Pass False to force local projection
+            of the master rules, e.g. to ignore per-instance modifications.
+
+    Yields:
+        ProjectedEventOccurrence objects, ordered by occurrence start.
     """
-    projected_occurrences: List[ProjectedEventOccurrence] = []
+    # A naive window is sent to the API as UTC (see calendar_actions._format_rfc3339);
+    # make it aware the same way, so it compares with the aware instance times
+    if time_min.tzinfo is None:
+        time_min = time_min.replace(tzinfo=timezone.utc)
+    if time_max.tzinfo is None:
+        time_max = time_max.replace(tzinfo=timezone.utc)
 
     logger.info(f"Starting projection of recurring events for calendar '{calendar_id}'")
     logger.info(f"Projection window: {time_min} to {time_max}. Query: '{event_query or 'None'}'")
 
+    # Without a query on master definitions the API can do the expansion for us
+    if expand_on_server and event_query is None and not calendar_ids:
+        projected_occurrences = _project_server_side(credentials, time_min, time_max, calendar_id)
+        logger.info(f"Finished server-side projection. Found {len(projected_occurrences)} total occurrences.")
+        projected_occurrences.sort(key=_OCCURRENCE_START)
+        yield from projected_occurrences
+        return
+
     # 1. Find master recurring events (not single instances)
-    # We need events *within* the window OR whose recurrence *starts* before the window ends
-    # and *might* generate instances within the window.
-    # Finding events without timeMin/timeMax might be too broad.
-    # A safe approach is to find master events potentially active *before* the window ends.
-    master_events_response = calendar_actions.find_events(
+    # The API filters masters server-side by the window: series that ended before
+    # time_min or start after time_max are never transferred.
+    find_kwargs = dict(
         credentials=credentials,
-        calendar_id=calendar_id,
-        # timeMax=time_max, # Find masters that haven't ended before our window
-        q=event_query,
+        time_min=time_min,
+        time_max=time_max,
+        query=event_query,
         single_events=False, # Crucial: Get the master event definition
         showDeleted=False,
-        max_results=2500 # Adjust as needed, API max is 2500
+        max_results=2500 # Page size; API max is 2500
     )
-
-    if not master_events_response or not master_events_response.items:
+    if calendar_ids:
+        responses = list(calendar_actions.find_events_batch(calendar_ids=calendar_ids, **find_kwargs).values())
+    else:
+        # Pages stream in with the next one prefetched while the current one is parsed
+        responses = calendar_actions.iter_event_pages(calendar_id=calendar_id, **find_kwargs)
+
+    master_events = [event for response in responses if response for event in response.items]
+    if not master_events:
         logger.info("No master recurring events found matching the criteria.")
-        return []
+        return
 
-    logger.debug(f"Found {len(master_events_response.items)} potential master events.")
+    logger.debug(f"Found {len(master_events)} potential master events.")
 
-    # 2. Iterate through master events and parse recurrence rules
-    for event in master_events_response.items:
-        if not event.recurrence:
-            # logger.debug(f"Skipping non-recurring event: {event.summary} ({event.id})")
-            continue # Skip non-recurring events
+    # 2. Expand each master event independently. The expansion is pure Python and
+    # holds the GIL, so threads only pay off when max_workers is raised explicitly.
+    if max_workers > 1 and len(master_events) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            per_event = list(executor.map(lambda e: _project_one(e, time_min, time_max), master_events))
+    else:
+        per_event = [_project_one(event, time_min, time_max) for event in master_events]
 
-        if not event.start or not (event.start.dateTime or event.start.date):
-             logger.warning(f"Skipping recurring event without start time: {event.summary} ({event.id})")
-             continue
+    logger.info(f"Finished projection. Found {sum(map(len, per_event))} total occurrences.")
+    # Each event's occurrences are already chronological, so a lazy k-way merge over
+    # the per-event lists orders everything in O(N log K) instead of a global sort
+    yield from heapq.merge(*per_event, key=_OCCURRENCE_START)
 
-        # Determine the start datetime of the recurrence series (dtstart)
-        # Handle both date and dateTime cases
-        dtstart_obj: Optional[datetime] = None
-        event_duration: Optional[timedelta] = None
-
-        if event.start.dateTime:
-            try:
-                # Use dateutil parser for robust ISO parsing
-                dtstart_obj = date_parser.isoparse(event.start.dateTime)
-                if event.end and event.end.dateTime:
-                    dtend_obj = date_parser.isoparse(event.end.dateTime)
-                    event_duration = dtend_obj - dtstart_obj
-                else:
-                    # Default duration for dateTime events if end is missing (e.g., 1 hour)
-                    event_duration = timedelta(hours=1)
-                    logger.warning(f"Recurring event '{event.summary}' missing end.dateTime, assuming {event_duration} duration.")
-            except ValueError as e:
-                 logger.error(f"Could not parse dateTime for event {event.summary} ({event.id}): {e}")
-                 continue
-        elif event.start.date:
-            try:
-                # All-day event - parse date and set time to midnight
-                start_date = date_parser.parse(event.start.date).date()
-                # Make dtstart timezone-aware if time_min is, otherwise naive UTC
-                dtstart_obj = datetime.combine(start_date, datetime.min.time())
-                if time_min.tzinfo:
-                     # Try to use the target window's timezone, otherwise UTC fallback
-                     dtstart_obj = dtstart_obj.replace(tzinfo=time_min.tzinfo)
-                # else:
-                     # dtstart_obj = dtstart_obj.replace(tzinfo=timezone.utc) # Requires import
-
-                # Duration for all-day events is typically 1 day
-                if event.end and event.end.date:
-                    end_date = date_parser.parse(event.end.date).date()
-                    event_duration = end_date - start_date # This includes the start day but excludes the end day
-                else:
-                    event_duration = timedelta(days=1) # Assume single all-day event
-            except ValueError as e:
-                 logger.error(f"Could not parse date for event {event.summary} ({event.id}): {e}")
-                 continue
-
-        if not dtstart_obj or event_duration is None:
-             logger.error(f"Could not determine dtstart or duration for event {event.summary} ({event.id})")
-             continue
-
-        # Extract RRULE, EXDATE, RDATE strings
-        # Google Calendar API returns recurrence as a list of strings
-        # e.g., ['RRULE:FREQ=WEEKLY;UNTIL=20110701T170000Z', 'EXDATE:20110610T100000Z']
-        rrule_str: Optional[str] = None
-        exdate_strs: List[str] = []
-        rdate_strs: List[str] = []
-        for rule_str in event.recurrence:
-            if rule_str.startswith('RRULE:'):
-                rrule_str = rule_str # Assume only one RRULE per event
-            elif rule_str.startswith('EXDATE'):
-                exdate_strs.append(rule_str)
-            elif rule_str.startswith('RDATE'):
-                rdate_strs.append(rule_str)
-
-        if not rrule_str:
-            logger.warning(f"Recurring event '{event.summary}' ({event.id}) has no RRULE string. Skipping.")
-            continue
 
-        try:
-            # Parse the main recurrence rule
-            # Pass dtstart, which is essential for rrule calculations
-            ruleset = rrule.rruleset()
-            # Use rrulestr which handles RRULE and dtstart implicitly if not provided otherwise
-            # We need to make sure the timezone handling matches dtstart_obj
-            main_rule = rrule.rrulestr(rrule_str, dtstart=dtstart_obj, forceset=True) # forceset=True to handle COUNT/UNTIL easily
-            ruleset.rrule(main_rule[0]) # Add the parsed rule to the set
-
-            # Add exception dates (EXDATE)
-            for exdate_str in exdate_strs:
-                # EXDATE format: "EXDATE;TZID=Europe/Zurich:20110426T080000,20110428T080000"
-                # Or "EXDATE:20240101" (all-day)
-                # Or "EXDATE:20240101T100000Z" (UTC)
-                # dateutil.rrule.rrulestr can parse EXDATE directly if part of the string,
-                # but Google separates them. We need to parse dates/datetimes manually.
-                # Split by ':' and then by ','
-                parts = exdate_str.split(':', 1)
-                if len(parts) == 2:
-                    param_str, dates_str = parts
-                    dates = dates_str.split(',')
-                    params = {}
-                    if ';' in param_str: # Check for TZID or VALUE=DATE
-                       param_parts = param_str.split(';')[1:] # Skip EXDATE itself
-                       for part in param_parts:
-                           if '=' in part:
-                               key, value = part.split('=', 1)
-                               params[key.upper()] = value
-
-                    is_all_day = params.get('VALUE') == 'DATE'
-                    tz_id = params.get('TZID')
-                    # TODO: Handle TZID properly using pytz if needed
-
-                    for date_str in dates:
-                        try:
-                            if is_all_day:
-                                ex_date = date_parser.parse(date_str).date()
-                                # Create datetime at midnight for comparison/ruleset
-                                ex_dt = datetime.combine(ex_date, datetime.min.time())
-                                if dtstart_obj.tzinfo: # Match tzinfo
-                                    ex_dt = ex_dt.replace(tzinfo=dtstart_obj.tzinfo)
-                            else:
-                                ex_dt = date_parser.isoparse(date_str)
-                                # TODO: Apply TZID if present
-
-                            ruleset.exdate(ex_dt)
-                        except ValueError:
-                            logger.warning(f"Could not parse EXDATE value '{date_str}' for event {event.id}")
-
-            # Add explicit recurrence dates (RDATE) - Less common?
-            # Similar parsing logic as EXDATE if needed.
-            # for rdate_str in rdate_strs: ... ruleset.rdate(...)
-
-            # Generate occurrences within the desired window [time_min, time_max)
-            # Note: rruleset.between includes dates equal to dtstart/until
-            occurrences = ruleset.between(time_min, time_max, inc=True) # inc=True includes time_min
-
-            logger.debug(f"Event '{event.summary}' ({event.id}): Found {len(occurrences)} occurrences via rrule.")
-
-            for occ_start_dt in occurrences:
-                 # Ensure timezone consistency if needed
-                 if dtstart_obj.tzinfo and occ_start_dt.tzinfo is None:
-                      occ_start_dt = occ_start_dt.replace(tzinfo=dtstart_obj.tzinfo)
-                 elif not dtstart_obj.tzinfo and occ_start_dt.tzinfo:
-                      occ_start_dt = occ_start_dt.replace(tzinfo=None)
-
-                 # Calculate occurrence end time
-                 occ_end_dt = occ_start_dt + event_duration
-
-                 # Double check if the occurrence actually overlaps the window
-                 # ruleset.between should handle this, but an extra check might be useful
-                 # if occ_start_dt < time_max and occ_end_dt > time_min:
-                 projected_occurrences.append(
-                      ProjectedEventOccurrence(
-                           original_event_id=event.id,
-                           original_summary=event.summary or "No Summary",
-                           occurrence_start=occ_start_dt,
-                           occurrence_end=occ_end_dt
-                      )
-                 )
+def project_recurring_events(
+    credentials: Credentials,
+    time_min: datetime,
+    time_max: datetime,
+    calendar_id: str = 'primary',
+    event_query: Optional[str] = None,
+    calendar_ids: Optional[List[str]] = None,
+    max_workers: int = 1,
+    expand_on_server: bool = True
+) -> List[ProjectedEventOccurrence]:
+    """Finds recurring events and projects their occurrences within a time window.
 
-        except Exception as e:
-            logger.error(f"Failed to parse/process recurrence for event '{event.summary}' ({event.id}): {e}", exc_info=True)
-            continue # Skip this event
+    Materializes iter_project_recurring_events; see it for the arguments.
 
-    logger.info(f"Finished projection. Found {len(projected_occurrences)} total occurrences.")
-    # Sort occurrences chronologically?
-    projected_occurrences.sort(key=lambda x: x.occurrence_start)
-    return projected_occurrences 
+    Returns:
+        A list of ProjectedEventOccurrence objects representing calculated occurrences.
+    """
+    return list(iter_project_recurring_events(
+        credentials=credentials,
+        time_min=time_min,
+        time_max=time_max,
+        calendar_id=calendar_id,
+        event_query=event_query,
+        calendar_ids=calendar_ids,
+        max_workers=max_workers,
+        expand_on_server=expand_on_server
+    ))
 
 
 def analyze_busyness(
@@ -248,6 +580,7 @@ def analyze_busyness(
     time_min: datetime,
     time_max: datetime,
     calendar_id: str = 'primary',
+    fill_zero_days: bool = False
 ) -> Dict[date, Dict[str, Any]]:
     """Analyzes event count and total duration per day within a time window.
 
@@ -256,90 +589,89 @@ def analyze_busyness(
         time_min: Start of the analysis window (timezone-aware recommended).
         time_max: End of the analysis window (timezone-aware recommended).
         calendar_id: The calendar to analyze.
+        fill_zero_days: Include every day of the window, with zero stats for days
+            without events. By default only days that had events are returned.
 
     Returns:
         A dictionary mapping each date within the window to its busyness stats:
         {'event_count': int, 'total_duration_minutes': float}
     """
-    busyness_by_date: Dict[date, Dict[str, Any]] = defaultdict(lambda: {'event_count': 0, 'total_duration_minutes': 0.0})
-
     logger.info(f"Starting busyness analysis for calendar '{calendar_id}'")
     logger.info(f"Analysis window: {time_min} to {time_max}")
 
-    # 1. Find all event instances in the range
-    events_response = calendar_actions.find_events(
+    # 1. Stream all event instances in the range page by page; the next page
+    # downloads while the current one is reduced below
+    pages = calendar_actions.iter_event_pages(
         credentials=credentials,
         calendar_id=calendar_id,
         time_min=time_min,
         time_max=time_max,
         single_events=True, # Get individual instances
         showDeleted=False,
-        max_results=2500 # Consider pagination for very long ranges
+        max_results=2500 # Page size; API max is 2500
     )
 
-    if not events_response or not events_response.items:
-        logger.info("No events found in the specified time range for busyness analysis.")
-        return dict(busyness_by_date) # Return empty default dict converted to regular dict
-
-    logger.debug(f"Found {len(events_response.items)} event instances for analysis.")
-
-    # 2. Process events and aggregate stats by date
-    for event in events_response.items:
-        start_dt: Optional[datetime] = None
-        end_dt: Optional[datetime] = None
-        event_date: Optional[date] = None
-
-        # Determine start and end datetimes/dates
-        if event.start:
-            if event.start.dateTime:
-                try:
-                    start_dt = date_parser.isoparse(event.start.dateTime)
-                    event_date = start_dt.date()
-                except ValueError: logger.warning(f"Could not parse start dateTime: {event.start.dateTime}"); continue
-            elif event.start.date:
-                try:
-                    event_date = date_parser.parse(event.start.date).date()
-                    # All-day events don't have a specific duration from start/end times typically
-                except ValueError: logger.warning(f"Could not parse start date: {event.start.date}"); continue
-
-        if not event_date:
-            logger.warning(f"Event '{event.summary}' ({event.id}) missing valid start information. Skipping.")
+    # Day-offset bounds computed once; per-day totals live in two fixed-size lists
+    # indexed by day offset from the window start
+    base = time_min.date()
+    n_days = max(0, (time_max.date() - base).days)
+
+    # 2. Column pass: reduce each event to (day offset, duration) in two parallel lists.
+    # Event times were already parsed to datetimes during EventsResponse validation,
+    # so this is attribute access and arithmetic only; no per-event string parsing.
+    # The API only returns events overlapping the window, so the one bounds check here
+    # merely drops those that started before it (or on time_max's partial last day).
+    event_days: List[int] = []
+    durations: List[float] = []
+    add_day = event_days.append
+    add_duration = durations.append
+    for event in chain.from_iterable(page.items for page in pages):
+        start = event.start
+        end = event.end
+        duration_min = 0.0 # All-day events don't have a specific duration from start/end times
+        try:
+            if start and start.dateTime:
+                start_dt = _iso(start.dateTime)
+                event_date = start_dt.date()
+                if end and end.dateTime:
+                    duration_min = max(0.0, (_iso(end.dateTime) - start_dt).total_seconds() / 60.0)
+            elif start and start.date:
+                event_date = _date(start.date)
+            else:
+                logger.warning(f"Event '{event.summary}' ({event.id}) missing valid start information. Skipping.")
+                continue
+        except ValueError:
+            logger.warning(f"Could not parse start/end for event {event.id}")
             continue
-
-        # Ensure the event actually starts within our analysis window bounds
-        # (API might return events overlapping the start/end)
-        # Need to compare dates correctly (timezone awareness)
-        if not (time_min.date() <= event_date < time_max.date()):
-             # Basic date check; refine if timezone crossing near midnight is critical
-             # logger.debug(f"Skipping event {event.id} starting outside date range: {event_date}")
-             continue
-
-        # Increment event count for the date
-        busyness_by_date[event_date]['event_count'] += 1
-
-        # Calculate duration for non-all-day events
-        if start_dt and event.end and event.end.dateTime:
-            try:
-                end_dt = date_parser.isoparse(event.end.dateTime)
-                duration = end_dt - start_dt
-                # Add duration in minutes, handle potential negative duration if times are swapped?
-                busyness_by_date[event_date]['total_duration_minutes'] += max(0, duration.total_seconds() / 60.0)
-            except ValueError:
-                logger.warning(f"Could not parse end dateTime: {event.end.dateTime} for event {event.id}")
-            except TypeError:
-                logger.warning(f"Could not calculate duration for event {event.id} (start: {start_dt}, end: {end_dt})")
-
-
-    # Fill in days with zero events within the range?
-    # Optional: Iterate from time_min.date() to time_max.date() and ensure all keys exist
-    # current_date = time_min.date()
-    # while current_date < time_max.date():
-    #     if current_date not in busyness_by_date:
-    #         busyness_by_date[current_date] = {'event_count': 0, 'total_duration_minutes': 0.0}
-    #     current_date += timedelta(days=1)
-
-    # Convert defaultdict back to regular dict and sort by date
-    sorted_busyness = dict(sorted(busyness_by_date.items()))
-
-    logger.info(f"Finished busyness analysis. Analyzed {len(sorted_busyness)} days.")
-    return sorted_busyness 
\ No newline at end of file
+        except TypeError:
+            # Mixed naive/aware start and end; count the event without a duration
+            logger.warning(f"Could not calculate duration for event {event.id} (start: {start}, end: {end})")
+        idx = (event_date - base).days
+        if 0 <= idx < n_days:
+            add_day(idx)
+            add_duration(duration_min)
+
+    if not event_days:
+        logger.info("No events found in the specified time range for busyness analysis.")
+        if not fill_zero_days:
+            return {}
+
+    logger.debug(f"Found {len(event_days)} event instances for analysis.")
+
+    # 3. Aggregate stats by date; offsets are already in range, so no checks here
+    counts = [0] * n_days
+    minutes = [0.0] * n_days
+    for idx, duration_min in zip(event_days, durations):
+        counts[idx] += 1
+        minutes[idx] += duration_min
+
+    # The per-day lists already span the whole window, so filling zero days is just
+    # keeping the empty buckets; index order is already date order
+    busyness_by_date: Dict[date, Dict[str, Any]] = {
+        base + timedelta(days=i): {'event_count': count, 'total_duration_minutes': total}
+        for i, (count, total) in enumerate(zip(counts, minutes))
+        if count or fill_zero_days
+    }
+
+    logger.info(f"Finished busyness analysis. Analyzed {len(busyness_by_date)} days.")
+    return busyness_by_date
@@ -1,14 +1,11 @@
 import os
-import webbrowser
-import http.server
-import socketserver
-from urllib.parse import urlparse, parse_qs
+import asyncio
 import threading
 import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from dotenv import load_dotenv
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,97 +23,105 @@ REDIRECT_PORT = int(os.getenv('OAUTH_CALLBACK_PORT', 8080))
 REDIRECT_URI = f'http://localhost:{REDIRECT_PORT}/oauth2callback'
 # Note: REDIRECT_URI must be registered in your Google Cloud Console OAuth Client settings!
 
-# --- Helper Classes/Functions ---
-
-class OAuthCallbackHandler(http.server.SimpleHTTPRequestHandler):
-    """Handles the OAuth callback request to capture the authorization code."""
-    def __init__(self, *args, flow_instance=None, shutdown_event=None, **kwargs):
-        self.flow = flow_instance
-        self.shutdown_event = shutdown_event
-        self.auth_code = None
-        self.error = None
-        super().__init__(*args, **kwargs)
-
-    def do_GET(self):
-        """Handle GET requests (the OAuth callback)."""
-        query_components = parse_qs(urlparse(self.path).query)
-        code = query_components.get('code')
-        error = query_components.get('error')
-
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-
-        if code:
-            self.auth_code = code[0]
-            logger.info("Authorization code received.")
-            self.wfile.write(b'<html><body><h1>Authentication Successful!</h1>')
-            self.wfile.write(b'<p>Authorization code received. You can close this window.</p></body></html>')
-        elif error:
-            self.error = error[0]
-            logger.error(f"OAuth Error: {self.error}")
-            self.wfile.write(b'<html><body><h1>Authentication Failed</h1>')
-            self.wfile.write(f'<p>Error: {self.error}. Please check console.</p></body></html>'.encode())
-        else:
-            logger.warning("Received callback without code or error.")
-            self.wfile.write(b'<html><body><h1>Invalid Callback</h1>')
-            self.wfile.write(b'<p>Received an unexpected request.</p></body></html>')
-
-        # Signal the main thread to stop the server
-        if self.shutdown_event:
-            self.shutdown_event.set()
-
-def start_local_http_server(port, flow, shutdown_event):
-    """Starts a temporary local HTTP server to handle the OAuth callback."""
-    handler = lambda *args, **kwargs: OAuthCallbackHandler(
-        *args, flow_instance=flow, shutdown_event=shutdown_event, **kwargs
-    )
-    httpd = None
+# Credentials are kept in-process once obtained; the token file is only read on a cold
+# start. Tokens within the skew of their expiry are refreshed proactively.
+_CREDS_CACHE: Optional[Credentials] = None
+_CREDS_LOCK = threading.Lock()
+_CREDS_EXPIRY_SKEW = timedelta(minutes=5)
+
+# One google-auth transport (and its requests.Session) shared by every token refresh,
+# so refreshes reuse the pooled TLS connection to the token endpoint.
+_AUTH_REQUEST = None
+
+# --- Helper Functions ---
+
+def _needs_refresh(creds: Optional[Credentials]) -> bool:
+    """True if there is no usable token or it expires within _CREDS_EXPIRY_SKEW.
+
+    Plain arithmetic on creds.expiry (naive UTC) so a token with minutes left is
+    never refreshed early, and one about to lapse is refreshed before it does.
+    """
+    if creds is None or not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    return creds.expiry - _CREDS_EXPIRY_SKEW <= datetime.now(timezone.utc).replace(tzinfo=None)
+
+def auth_request():
+    """Returns the shared google-auth Request transport, creating it on first use.
+
+    Imported here: the requests transport is only needed on a refresh.
+    """
+    global _AUTH_REQUEST
+    if _AUTH_REQUEST is None:
+        import requests
+        from google.auth.transport.requests import Request
+        _AUTH_REQUEST = Request(session=requests.Session())
+    return _AUTH_REQUEST
+
+def _save_credentials(creds: Credentials) -> None:
+    """Writes the token file atomically with owner-only permissions.
+
+    The JSON goes to a temporary file, created 0600 so the refresh token is never
+    readable by others, and synced to disk before it is renamed over TOKEN_FILE. A
+    crash or power loss mid-write can never leave a torn token file that forces a
+    full re-authentication.
+    """
+    tmp_path = TOKEN_FILE + '.tmp'
     try:
-        httpd = socketserver.TCPServer(("", port), handler)
-        logger.info(f"Starting temporary OAuth callback server on port {port}")
-        httpd.serve_forever() # This blocks until shutdown is called
-    except OSError as e:
-        logger.error(f"Failed to start callback server on port {port}: {e}")
-        # Signal error if server couldn't start
-        if shutdown_event:
-             shutdown_event.set() # Also signal to stop waiting
-        return None, None # Return None for handler if server failed
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as token_file:
+            token_file.write(creds.to_json())
+            token_file.flush()
+            os.fsync(token_file.fileno())
+        # The mode only applies when the file is created; tighten a leftover one
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, TOKEN_FILE)
+        logger.info(f"Credentials saved successfully to {TOKEN_FILE}")
     except Exception as e:
-        logger.error(f"An unexpected error occurred in the callback server: {e}")
-        if shutdown_event:
-             shutdown_event.set()
-        return None, None
-    finally:
-        if httpd:
-            logger.info("Shutting down OAuth callback server.")
-            # httpd.shutdown() # This should be called from another thread or after serve_forever unblocks
-            # httpd.server_close() # Clean up the socket
-            pass # Shutdown handled by the event
-
-    # This part is tricky because serve_forever blocks.
-    # The handler instance is associated with the request, not the server itself long-term.
-    # We need a way to get the code back to the main thread. The handler sets it.
-    # Let's assume the handler instance associated with the successful callback request is somehow accessible
-    # or that the main thread can access the handler's state after shutdown.
-    # A more robust way might use queues or other IPC.
-    # For now, let's return the handler type, but the instance holding the code is key.
-    # We will retrieve the code *after* the server is shut down.
-    # The handler instance is tricky to get back here directly after serve_forever.
-    # Let's return the server instance, shutdown called externally based on event.
-    return httpd, handler # Returning the handler *type* here. Need instance capture.
+        logger.error(f"Failed to save credentials to {TOKEN_FILE}: {e}")
 
 def get_credentials():
-    """Gets valid Google API credentials. Handles loading, refreshing, and the OAuth flow."""
-    creds = None
-
+    """Gets valid Google API credentials. Handles loading, refreshing, and the OAuth flow.
+
+    Credentials are cached in-process; the steady state is an expiry check with no
+    disk I/O. Safe to call from multiple threads.
+    """
+    global _CREDS_CACHE
+    creds = _CREDS_CACHE
+    if not _needs_refresh(creds):
+        return creds
+
+    with _CREDS_LOCK:
+        # Another thread may have refreshed while we waited for the lock
+        creds = _CREDS_CACHE
+        if not _needs_refresh(creds):
+            return creds
+        creds = _load_credentials(creds)
+        if creds:
+            _CREDS_CACHE = creds
+        return creds
+
+async def get_credentials_async():
+    """Async variant of get_credentials for use on an event loop.
+
+    A cached, unexpired token is returned inline. Cache misses (token file read,
+    refresh round trip, OAuth flow) run in a worker thread so they never block the loop.
+    """
+    creds = _CREDS_CACHE
+    if not _needs_refresh(creds):
+        return creds
+    return await asyncio.to_thread(get_credentials)
+
+def _load_credentials(creds: Optional[Credentials]):
+    """Loads, refreshes, or obtains credentials, starting from the cached ones if any."""
     # Check if mandatory config is present
     if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
         logger.error("Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET in .env file.")
         raise ValueError("Missing Google OAuth credentials in configuration.")
 
     # --- 1. Load existing tokens ---
-    if os.path.exists(TOKEN_FILE):
+    if creds is None and os.path.exists(TOKEN_FILE):
         try:
             creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
             logger.info("Loaded credentials from token file.")
@@ -125,12 +130,13 @@ def get_credentials():
             creds = None # Ensure creds is None if loading failed
 
     # --- 2. Refresh or Initiate Flow ---
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            logger.info("Credentials expired. Refreshing...")
+    if _needs_refresh(creds):
+        if creds and creds.refresh_token:
+            logger.info("Credentials expired or about to expire. Refreshing...")
             try:
-                creds.refresh(Request())
+                creds.refresh(auth_request())
                 logger.info("Credentials refreshed successfully.")
+                _save_credentials(creds)
             except Exception as e:
                 logger.error(f"Failed to refresh credentials: {e}. Need to re-authenticate.")
                 creds = None # Force re-authentication
@@ -147,7 +153,9 @@ def get_credentials():
                 }
             }
             try:
-                # Use InstalledAppFlow instead of Flow
+                # Use InstalledAppFlow instead of Flow; imported lazily since the
+                # interactive flow (and oauthlib) is only needed without a saved token
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 logger.info("Attempting authentication using InstalledAppFlow...")
                 flow_installed = InstalledAppFlow.from_client_config(
                     client_config=client_config,
@@ -169,18 +177,13 @@ def get_credentials():
 
             if creds:
                 # Save the credentials for the next run
-                try:
-                    with open(TOKEN_FILE, 'w') as token_file:
-                        token_file.write(creds.to_json())
-                    logger.info(f"Credentials saved successfully to {TOKEN_FILE}")
-                except Exception as e:
-                    logger.error(f"Failed to save credentials to {TOKEN_FILE}: {e}")
+                _save_credentials(creds)
             else:
                 logger.error("OAuth flow using InstalledAppFlow did not result in valid credentials.")
                 return None
 
     # --- 3. Final Check ---
-    if not creds or not creds.valid:
+    if _needs_refresh(creds):
         logger.error("Failed to obtain valid credentials after all steps.")
         return None
 
@@ -1,13 +1,22 @@
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, date, timedelta, time, timezone
-from typing import Optional, List, Dict, Any, Tuple
-from dateutil import parser # For robust datetime parsing
-import json
+from typing import Optional, List, Dict, Any, Tuple, Iterator, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from googleapiclient.discovery import build
+import orjson
+from pydantic import TypeAdapter
+
+# googleapiclient.discovery and google_auth_httplib2 (with httplib2 under them) are
+# imported when the first service client is built, not with this module
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 
+if TYPE_CHECKING:
+    from googleapiclient.http import BatchHttpRequest
+
 from .models import (
     GoogleCalendarEvent,
     EventsResponse,
@@ -31,20 +40,159 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Serializes update_event's attendee list in one call; built once at import
+_ATTENDEE_LIST_ADAPTER = TypeAdapter(List[EventAttendee])
+
 # --- Helper Function to Build Service ---
 
+# Built service clients, per thread: build() parses the discovery document and
+# generates the resource classes every time, and the httplib2 connection inside a
+# client must not be shared between threads. Keyed by id(credentials); the entry
+# holds the credentials too, so the id cannot be reused while it is cached.
+_service_cache = threading.local()
+# auth.py hands out one cached Credentials object, so a thread rarely sees more
+_SERVICE_CACHE_SIZE = 4
+
 def _get_calendar_service(credentials: Credentials):
-    """Builds the Google Calendar API service client."""
+    """Returns the Google Calendar API service client, built once per thread and credentials."""
+    services = getattr(_service_cache, 'services', None)
+    if services is None:
+        services = _service_cache.services = {}
+    cached = services.get(id(credentials))
+    if cached is not None and cached[0] is credentials:
+        return cached[1]
+
+    from googleapiclient.discovery import build
+    from googleapiclient.http import build_http
+    from google_auth_httplib2 import AuthorizedHttp
+
+    # One httplib2.Http per thread under every client the thread builds, so a client
+    # for new credentials reuses the thread's open TLS connection to the API
+    http = getattr(_service_cache, 'http', None)
+    if http is None:
+        http = _service_cache.http = build_http()
+
     try:
-        service = build('calendar', 'v3', credentials=credentials)
+        # The calendar discovery document ships with google-api-python-client; use
+        # it rather than fetching it or reading the file cache on the first build
+        service = build(
+            'calendar', 'v3', http=AuthorizedHttp(credentials, http=http),
+            static_discovery=True, cache_discovery=False,
+        )
         logger.debug("Google Calendar service client created successfully.")
-        return service
     except Exception as e:
         logger.error(f"Failed to build Google Calendar service: {e}", exc_info=True)
         raise  # Re-raise the exception to be handled by the caller
 
+    if len(services) >= _SERVICE_CACHE_SIZE:
+        services.clear()
+    services[id(credentials)] = (credentials, service)
+    return service
+
+# --- Attendee Cache ---
+
+# ETag and attendee list of recently read or written events, keyed by
+# (calendar_id, event_id). add_attendee patches against the cached list with
+# If-Match instead of fetching the event first; if the event has changed since,
+# the patch fails with 412 and the event is fetched again.
+_ATTENDEE_CACHE_SIZE = 256
+_attendee_cache: "OrderedDict[Tuple[str, str], Tuple[str, List[Dict[str, Any]]]]" = OrderedDict()
+_attendee_cache_lock = threading.Lock()
+
+def _remember_attendees(calendar_id: str, event_id: str, event: Dict[str, Any]) -> None:
+    """Caches the ETag and attendees of an event resource returned by the API."""
+    key = (calendar_id, event_id)
+    etag = event.get('etag')
+    with _attendee_cache_lock:
+        if not etag:
+            _attendee_cache.pop(key, None)
+            return
+        _attendee_cache[key] = (etag, event.get('attendees', []))
+        _attendee_cache.move_to_end(key)
+        if len(_attendee_cache) > _ATTENDEE_CACHE_SIZE:
+            _attendee_cache.popitem(last=False)
+
+def _forget_attendees(calendar_id: str, event_id: str) -> None:
+    with _attendee_cache_lock:
+        _attendee_cache.pop((calendar_id, event_id), None)
+
+def _cached_attendees(calendar_id: str, event_id: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    with _attendee_cache_lock:
+        return _attendee_cache.get((calendar_id, event_id))
+
 # --- Calendar Action Functions ---
 
+def _format_rfc3339(dt: datetime) -> str:
+    """Formats a datetime as RFC3339 for the API. Naive datetimes are taken as UTC."""
+    # isoformat rather than a strftime pattern: it is about 3x faster, and %z renders
+    # offsets as -0500 where RFC3339 requires -05:00
+    return dt.isoformat() + 'Z' if dt.tzinfo is None else dt.isoformat()
+
+@lru_cache(maxsize=4096)
+def _attendee_dict(email: str) -> Dict[str, str]:
+    """The {'email': ...} attendee entry for a request body, shared between requests.
+
+    Only ever serialized into request bodies; never mutate the returned dict.
+    """
+    return {'email': email}
+
+def _log_http_error(error: HttpError, context: str) -> None:
+    """Logs an API error with its status and Google's error message.
+
+    HttpError already parsed the message out of the JSON error body (error.reason);
+    the raw body is only decoded when it was not a JSON error.
+    """
+    details = error.reason
+    if details == error.resp.reason:
+        details = error.content.decode('utf-8', 'replace')
+    logger.error(f"Google API error while {context}: {error.resp.status} - {details}", exc_info=True)
+
+# Google caps batch requests at 50 calls each
+_BATCH_LIMIT = 50
+
+def _build_list_kwargs(
+    calendar_id: str,
+    time_min: Optional[datetime],
+    time_max: Optional[datetime],
+    query: Optional[str],
+    max_results: int,
+    single_events: bool,
+    order_by: str,
+    iCalUID: Optional[str] = None,
+    sharedExtendedProperty: Optional[str] = None,
+    privateExtendedProperty: Optional[str] = None,
+    showDeleted: bool = False,
+    eventTypes: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Builds the keyword arguments for an events().list() request."""
+    # One dict, with optional parameters added only when set; the API rejects
+    # None values
+    list_kwargs: Dict[str, Any] = {
+        'calendarId': calendar_id,
+        'maxResults': max_results,
+        'singleEvents': single_events,
+        'showDeleted': showDeleted,
+    }
+    # Format datetime objects to RFC3339 string format required by the API
+    if time_min:
+        list_kwargs['timeMin'] = _format_rfc3339(time_min)
+    if time_max:
+        list_kwargs['timeMax'] = _format_rfc3339(time_max)
+    if query is not None:
+        list_kwargs['q'] = query
+    # The API only accepts orderBy=startTime when recurring events are expanded
+    if order_by is not None and (order_by != 'startTime' or single_events):
+        list_kwargs['orderBy'] = order_by
+    if iCalUID:
+        list_kwargs['iCalUID'] = iCalUID
+    if sharedExtendedProperty:
+        list_kwargs['sharedExtendedProperty'] = sharedExtendedProperty
+    if privateExtendedProperty:
+        list_kwargs['privateExtendedProperty'] = privateExtendedProperty
+    if eventTypes:
+        list_kwargs['eventTypes'] = eventTypes
+    return list_kwargs
+
 def find_events(
     credentials: Credentials,
     calendar_id: str = 'primary',
@@ -81,34 +229,24 @@ def find_events(
         An EventsResponse object containing the list of events, or None if an error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
-
-    # Format datetime objects to RFC3339 string format required by the API
-    time_min_str = time_min.isoformat() + 'Z' if time_min and time_min.tzinfo is None else (time_min.isoformat() if time_min else None)
-    time_max_str = time_max.isoformat() + 'Z' if time_max and time_max.tzinfo is None else (time_max.isoformat() if time_max else None)
 
-    # Build the arguments dictionary dynamically to avoid passing None values for optional params
-    list_kwargs = {
-        'calendarId': calendar_id,
-        'timeMin': time_min_str,
-        'timeMax': time_max_str,
-        'q': query,
-        'maxResults': max_results,
-        'singleEvents': single_events,
-        'orderBy': order_by,
-        'showDeleted': showDeleted,
-        # Conditionally add parameters if they are provided
-        **(({'iCalUID': iCalUID}) if iCalUID else {}),
-        **(({'sharedExtendedProperty': sharedExtendedProperty}) if sharedExtendedProperty else {}),
-        **(({'privateExtendedProperty': privateExtendedProperty}) if privateExtendedProperty else {}),
-        **(({'eventTypes': eventTypes}) if eventTypes else {}),
-    }
-    # Filter out None values from list_kwargs to avoid API errors for empty optional params
-    list_kwargs = {k: v for k, v in list_kwargs.items() if v is not None}
+    list_kwargs = _build_list_kwargs(
+        calendar_id=calendar_id,
+        time_min=time_min,
+        time_max=time_max,
+        query=query,
+        max_results=max_results,
+        single_events=single_events,
+        order_by=order_by,
+        iCalUID=iCalUID,
+        sharedExtendedProperty=sharedExtendedProperty,
+        privateExtendedProperty=privateExtendedProperty,
+        showDeleted=showDeleted,
+        eventTypes=eventTypes,
+    )
 
     logger.info(
-        f"Fetching events from calendar '{calendar_id}' with parameters: {list_kwargs}"
+        "Fetching events from calendar '%s' with parameters: %s", calendar_id, list_kwargs
         # f"time_min='{time_min_str}', time_max='{time_max_str}', query='{query}', "
         # f"max_results={max_results}, single_events={single_events}, order_by='{order_by}', "
         # f"iCalUID='{iCalUID}', sharedExtendedProperty='{sharedExtendedProperty}', "
@@ -119,57 +257,251 @@ def find_events(
     try:
         events_result = service.events().list(**list_kwargs).execute()
 
-        logger.info(f"Found {len(events_result.get('items', []))} events.")
+        logger.info("Found %s events.", len(events_result.get('items', [])))
 
-        # Parse the result using Pydantic models for validation and structure
-        events_response = EventsResponse(**events_result)
+        # Parse the result using Pydantic models for validation and structure.
+        # model_validate hands the dict straight to the compiled validator, without
+        # unpacking it into keyword arguments first.
+        events_response = EventsResponse.model_validate(events_result)
         return events_response
 
     except HttpError as error:
-        logger.error(f"An API error occurred while finding events: {error}", exc_info=True)
-        # Add more detailed logging if possible
-        try:
-            error_content = error.content.decode('utf-8')
-            logger.error(f"Google API error details (find_events): {error.resp.status} - {error_content}")
-        except Exception:
-            logger.error(f"Google API error details (find_events): {error.resp.status} - Could not decode error content.")
+        _log_http_error(error, "finding events")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred while finding events: {e}", exc_info=True)
         return None
 
-def create_event(
+def iter_event_pages(
     credentials: Credentials,
-    event_data: EventCreateRequest, # Use the Pydantic model for input validation
     calendar_id: str = 'primary',
-    send_notifications: bool = True # Whether to send notifications to attendees
-) -> Optional[GoogleCalendarEvent]:
-    """Creates a new event in the specified calendar.
+    time_min: Optional[datetime] = None,
+    time_max: Optional[datetime] = None,
+    query: Optional[str] = None,
+    max_results: int = 2500,
+    single_events: bool = True,
+    order_by: str = 'startTime',
+    showDeleted: bool = False
+) -> Iterator[EventsResponse]:
+    """Yields every page of an events().list() query, following nextPageToken.
+
+    The next page is requested on a background thread as soon as the current one
+    arrives, so its download overlaps with parsing and with the caller's processing
+    of the current page. Only one request is in flight at a time.
 
     Args:
         credentials: Valid Google OAuth2 credentials.
-        event_data: An EventCreateRequest object containing event details.
-        calendar_id: Calendar identifier.
-        send_notifications: Whether to send notifications about the creation to attendees.
+        calendar_id: Calendar identifier (e.g., 'primary', email address, or calendar ID).
+        time_min: Start of the time range (inclusive). If None, no lower bound.
+        time_max: End of the time range (exclusive). If None, no upper bound.
+        query: Free text search query.
+        max_results: Page size (the API caps this at 2500).
+        single_events: Whether to expand recurring events into single instances.
+        order_by: The order of the events returned ('startTime' or 'updated').
+        showDeleted: Whether to include deleted events in the results.
+
+    Yields:
+        One EventsResponse per page.
+
+    Raises:
+        HttpError: A page failed to load (logged first). Any other error while
+            fetching or parsing a page is logged and re-raised as well.
+    """
+    service = _get_calendar_service(credentials)
+    list_kwargs = _build_list_kwargs(
+        calendar_id=calendar_id,
+        time_min=time_min,
+        time_max=time_max,
+        query=query,
+        max_results=max_results,
+        single_events=single_events,
+        order_by=order_by,
+        showDeleted=showDeleted,
+    )
+    logger.info("Streaming events from calendar '%s' with parameters: %s", calendar_id, list_kwargs)
+
+    from googleapiclient.http import build_http
+    from google_auth_httplib2 import AuthorizedHttp
+
+    # The pages are fetched on the executor thread, and the caller may use this
+    # thread's cached client while the generator is suspended, so the prefetch gets
+    # a connection of its own
+    prefetch_http = AuthorizedHttp(credentials, http=build_http())
+    events = service.events()
+    request = events.list(**list_kwargs)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(request.execute, http=prefetch_http)
+        while pending is not None:
+            try:
+                raw_page = pending.result()
+                # Start downloading the next page before parsing this one
+                request = events.list_next(request, raw_page)
+                pending = (executor.submit(request.execute, http=prefetch_http)
+                           if request is not None else None)
+                page = EventsResponse.model_validate(raw_page)
+            except HttpError as error:
+                # Raised rather than ending the iteration, so callers never take the
+                # pages so far for the complete result
+                _log_http_error(error, "paging events")
+                raise
+            except Exception as e:
+                logger.error(f"An unexpected error occurred while paging events: {e}", exc_info=True)
+                raise
+            yield page
+
+def iter_events(
+    credentials: Credentials,
+    calendar_id: str = 'primary',
+    time_min: Optional[datetime] = None,
+    time_max: Optional[datetime] = None,
+    query: Optional[str] = None,
+    max_results: int = 2500,
+    single_events: bool = True,
+    order_by: str = 'startTime',
+    showDeleted: bool = False
+) -> Iterator[GoogleCalendarEvent]:
+    """Yields every event matching the query, across all pages.
+
+    Pages come from iter_event_pages, so the next page downloads while the events
+    of the current one are consumed. Takes the same arguments; max_results is the
+    page size.
+    """
+    for page in iter_event_pages(
+        credentials=credentials,
+        calendar_id=calendar_id,
+        time_min=time_min,
+        time_max=time_max,
+        query=query,
+        max_results=max_results,
+        single_events=single_events,
+        order_by=order_by,
+        showDeleted=showDeleted,
+    ):
+        yield from page.items
+
+def find_events_batch(
+    credentials: Credentials,
+    calendar_ids: List[str],
+    time_min: Optional[datetime] = None,
+    time_max: Optional[datetime] = None,
+    query: Optional[str] = None,
+    max_results: int = 50,
+    single_events: bool = True,
+    order_by: str = 'startTime',
+    showDeleted: bool = False
+) -> Dict[str, EventsResponse]:
+    """Finds events across several calendars using batched HTTP requests.
+
+    One events().list() call per calendar is packed into a multipart batch request,
+    so N calendars cost one round trip per 50 calendars instead of N.
+
+    Args:
+        credentials: Valid Google OAuth2 credentials.
+        calendar_ids: Calendar identifiers to query.
+        time_min: Start of the time range (inclusive). If None, no lower bound.
+        time_max: End of the time range (exclusive). If None, no upper bound.
+        query: Free text search query.
+        max_results: Maximum number of events to return per calendar.
+        single_events: Whether to expand recurring events into single instances.
+        order_by: The order of the events returned ('startTime' or 'updated').
+        showDeleted: Whether to include deleted events in the results.
 
     Returns:
-        A GoogleCalendarEvent object representing the created event, or None if an error occurs.
+        A dictionary mapping each calendar ID to its EventsResponse. Calendars whose
+        request failed are logged and omitted.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
+    results: Dict[str, EventsResponse] = {}
+
+    def _on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]):
+        if exception is not None:
+            logger.error(f"Batched events request failed for calendar '{request_id}': {exception}")
+            return
+        try:
+            results[request_id] = EventsResponse.model_validate(response)
+        except Exception as e:
+            logger.error(f"Could not parse batched events for calendar '{request_id}': {e}", exc_info=True)
+
+    unique_ids = list(dict.fromkeys(calendar_ids))
+    logger.info("Fetching events for %s calendars via batch request.", len(unique_ids))
+
+    for start in range(0, len(unique_ids), _BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_on_response)
+        for cal_id in unique_ids[start:start + _BATCH_LIMIT]:
+            list_kwargs = _build_list_kwargs(
+                calendar_id=cal_id,
+                time_min=time_min,
+                time_max=time_max,
+                query=query,
+                max_results=max_results,
+                single_events=single_events,
+                order_by=order_by,
+                showDeleted=showDeleted,
+            )
+            batch.add(service.events().list(**list_kwargs), request_id=cal_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while executing events batch: {e}", exc_info=True)
+
+    logger.info("Batch request returned events for %s of %s calendars.", len(results), len(unique_ids))
+    return results
+
+def batch_execute(
+    credentials: Credentials,
+    ops: List[Tuple[str, Dict[str, Any]]]
+) -> List[Any]:
+    """Runs several events() calls as batched HTTP requests.
+
+    Each op is a method name of the events collection ('insert', 'patch', 'update',
+    'delete', 'get', ...) and its keyword arguments. The ops are sent as one
+    multipart request per 50, so N writes cost ceil(N / 50) round trips instead of N.
 
+    Args:
+        credentials: Valid Google OAuth2 credentials.
+        ops: (method name, keyword arguments) pairs, e.g.
+             ('delete', {'calendarId': 'primary', 'eventId': '...'}).
+
+    Returns:
+        One entry per op, in order: the API response (empty for a delete), or the
+        exception the op failed with.
+    """
+    service = _get_calendar_service(credentials)
+    events = service.events()
+    pending = object()
+    results: List[Any] = [pending] * len(ops)
+
+    def _on_response(request_id: str, response: Any, exception: Optional[Exception]):
+        results[int(request_id)] = exception if exception is not None else response
+
+    logger.info("Executing %s event operations via batch request.", len(ops))
+    for start in range(0, len(ops), _BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_on_response)
+        for index in range(start, min(start + _BATCH_LIMIT, len(ops))):
+            kind, kwargs = ops[index]
+            try:
+                batch.add(getattr(events, kind)(**kwargs), request_id=str(index))
+            except Exception as e:  # Unknown method or invalid arguments
+                results[index] = e
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while executing event batch: {e}", exc_info=True)
+            for index in range(start, min(start + _BATCH_LIMIT, len(ops))):
+                if results[index] is pending:
+                    results[index] = e
+
+    failed = sum(isinstance(result, Exception) for result in results)
+    logger.info("Batch request completed: %s of %s operations succeeded.", len(ops) - failed, len(ops))
+    return results
+
+def _build_event_body(event_data: EventCreateRequest) -> Optional[Dict[str, Any]]:
+    """Builds the events().insert() body for an EventCreateRequest, or returns None
+    (after logging why) if the start or end is missing."""
     # --- Manually Construct Event Body --- 
     # Ensure datetime objects are formatted as strings for JSON serialization
     event_body: Dict[str, Any] = {}
 
-    def format_datetime_field(dt_obj: datetime) -> str:
-        if dt_obj.tzinfo is None:
-            # Assume UTC if timezone is naive
-            return dt_obj.isoformat() + 'Z'
-        else:
-            return dt_obj.isoformat()
-
     # Required fields
     if not event_data.start or not event_data.end:
         logger.error("Event creation failed: Start and End times are required.")
@@ -177,7 +509,7 @@ def create_event(
     
     event_body['start'] = {}
     if event_data.start.dateTime:
-        event_body['start']['dateTime'] = format_datetime_field(event_data.start.dateTime)
+        event_body['start']['dateTime'] = _format_rfc3339(event_data.start.dateTime)
         if event_data.start.timeZone:
             event_body['start']['timeZone'] = event_data.start.timeZone
     elif event_data.start.date:
@@ -188,7 +520,7 @@ def create_event(
 
     event_body['end'] = {}
     if event_data.end.dateTime:
-        event_body['end']['dateTime'] = format_datetime_field(event_data.end.dateTime)
+        event_body['end']['dateTime'] = _format_rfc3339(event_data.end.dateTime)
         if event_data.end.timeZone:
             event_body['end']['timeZone'] = event_data.end.timeZone
     elif event_data.end.date:
@@ -205,7 +537,7 @@ def create_event(
     if event_data.location:
         event_body['location'] = event_data.location
     if event_data.attendees:
-        event_body['attendees'] = [{'email': email} for email in event_data.attendees]
+        event_body['attendees'] = [_attendee_dict(email) for email in event_data.attendees]
     if event_data.recurrence:
         event_body['recurrence'] = event_data.recurrence
     if event_data.reminders:
@@ -215,38 +547,67 @@ def create_event(
     # Add other optional fields from EventCreateRequest if needed (e.g., colorId, transparency, etc.)
 
     # --- End Manual Construction ---
+    return event_body
 
-    logger.info(f"Creating event in calendar '{calendar_id}': {event_body.get('summary', '[No Summary]')}")
-    # Use json.dumps for accurate debug logging of what will be serialized
-    try:
-        event_body_json = json.dumps(event_body, indent=2) # Pretty print for readability
-        logger.debug(f"Event body for creation (JSON):\n{event_body_json}")
-    except TypeError as json_err:
-        # This should not happen now, but good to have a fallback log
-        logger.error(f"Could not serialize event_body for debug log: {json_err}")
-        logger.debug(f"Event body for creation (raw dict): {event_body}")
+def create_event(
+    credentials: Credentials,
+    event_data: EventCreateRequest, # Use the Pydantic model for input validation
+    calendar_id: str = 'primary',
+    send_notifications: bool = True, # Whether to send notifications to attendees
+    batch: Optional['BatchHttpRequest'] = None
+) -> Optional[GoogleCalendarEvent]:
+    """Creates a new event in the specified calendar.
+
+    Args:
+        credentials: Valid Google OAuth2 credentials.
+        event_data: An EventCreateRequest object containing event details.
+        calendar_id: Calendar identifier.
+        send_notifications: Whether to send notifications about the creation to attendees.
+        batch: If given, the insert is added to this batch instead of being executed;
+               its result goes to the batch callback.
+
+    Returns:
+        A GoogleCalendarEvent object representing the created event, or None if an error
+        occurs or the request was added to a batch.
+    """
+    service = _get_calendar_service(credentials)
+
+    event_body = _build_event_body(event_data)
+    if event_body is None:
+        return None
+
+    logger.info("Creating event in calendar '%s': %s", calendar_id, event_body.get('summary', '[No Summary]'))
+    # Serialize for the debug log only when it will be emitted; orjson shows exactly
+    # what will be sent, pretty printed for readability
+    if logger.isEnabledFor(logging.DEBUG):
+        try:
+            event_body_json = orjson.dumps(event_body, option=orjson.OPT_INDENT_2).decode()
+            logger.debug("Event body for creation (JSON):\n%s", event_body_json)
+        except TypeError as json_err:
+            # This should not happen now, but good to have a fallback log
+            logger.error(f"Could not serialize event_body for debug log: {json_err}")
+            logger.debug("Event body for creation (raw dict): %s", event_body)
+
+    request = service.events().insert(
+        calendarId=calendar_id,
+        body=event_body,
+        sendNotifications=send_notifications
+    )
+    if batch is not None:
+        batch.add(request)
+        return None
 
     try:
-        created_event = service.events().insert(
-            calendarId=calendar_id,
-            body=event_body,
-            sendNotifications=send_notifications
-        ).execute()
+        created_event = request.execute()
 
-        logger.info(f"Successfully created event with ID: {created_event.get('id')}")
+        logger.info("Successfully created event with ID: %s", created_event.get('id'))
 
         # Parse the created event using Pydantic model
         parsed_event = GoogleCalendarEvent(**created_event)
         return parsed_event
 
     except HttpError as error:
-        # Log the actual error response content for debugging
-        error_content = "Unknown error content"
-        try:
-            error_content = error.content.decode('utf-8')
-        except Exception:
-            pass # Keep default message if decoding fails
-        logger.error(f"Google API error while creating event: {error.resp.status} - {error_content}", exc_info=True) 
+        _log_http_error(error, "creating event")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred while creating event: {e}", exc_info=True)
@@ -270,10 +631,8 @@ def quick_add_event(
         A GoogleCalendarEvent object representing the created event, or None if an error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Quick adding event to calendar '{calendar_id}' with text: \"{text}\"")
+    logger.info("Quick adding event to calendar '%s' with text: \"%s\"", calendar_id, text)
 
     try:
         created_event = service.events().quickAdd(
@@ -282,58 +641,25 @@ def quick_add_event(
             sendNotifications=send_notifications
         ).execute()
 
-        logger.info(f"Successfully quick-added event with ID: {created_event.get('id')}")
+        logger.info("Successfully quick-added event with ID: %s", created_event.get('id'))
 
         # Parse the created event using Pydantic model
         parsed_event = GoogleCalendarEvent(**created_event)
         return parsed_event
 
     except HttpError as error:
-        logger.error(f"An API error occurred during quick add: {error}", exc_info=True)
-        # Add more detailed logging
-        try:
-            error_content = error.content.decode('utf-8')
-            logger.error(f"Google API error details (quick_add): {error.resp.status} - {error_content}")
-        except Exception:
-            logger.error(f"Google API error details (quick_add): {error.resp.status} - Could not decode error content.")
+        _log_http_error(error, "quick adding event")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred during quick add: {e}", exc_info=True)
         return None
 
-def update_event(
-    credentials: Credentials,
-    event_id: str,
-    update_data: EventUpdateRequest, # Use Pydantic model for partial update data
-    calendar_id: str = 'primary',
-    send_notifications: bool = True # Whether to send notifications
-) -> Optional[GoogleCalendarEvent]:
-    """Updates an existing event using patch semantics (only specified fields are changed).
-
-    Args:
-        credentials: Valid Google OAuth2 credentials.
-        event_id: The ID of the event to update.
-        update_data: An EventUpdateRequest object containing fields to update.
-        calendar_id: Calendar identifier.
-        send_notifications: Whether to send update notifications to attendees.
-
-    Returns:
-        A GoogleCalendarEvent object representing the updated event, or None if an error occurs.
-    """
-    service = _get_calendar_service(credentials)
-    if not service:
-        return None
-
+def _build_update_body(update_data: EventUpdateRequest) -> Dict[str, Any]:
+    """Builds the events().patch() body for an EventUpdateRequest. Empty when there
+    is nothing to change."""
     # Manually construct the update body dictionary
     update_body: Dict[str, Any] = {}
 
-    # Helper function (can be reused or defined locally)
-    def format_datetime_field(dt_obj: datetime) -> str:
-        if dt_obj.tzinfo is None:
-            return dt_obj.isoformat() + 'Z'
-        else:
-            return dt_obj.isoformat()
-
     # Populate update_body only with fields present in update_data
     if update_data.summary is not None:
         update_body['summary'] = update_data.summary
@@ -346,7 +672,7 @@ def update_event(
     if update_data.start is not None:
         start_details = {}
         if update_data.start.dateTime:
-            start_details['dateTime'] = format_datetime_field(update_data.start.dateTime)
+            start_details['dateTime'] = _format_rfc3339(update_data.start.dateTime)
             if update_data.start.timeZone:
                 start_details['timeZone'] = update_data.start.timeZone
         elif update_data.start.date:
@@ -359,7 +685,7 @@ def update_event(
     if update_data.end is not None:
         end_details = {}
         if update_data.end.dateTime:
-            end_details['dateTime'] = format_datetime_field(update_data.end.dateTime)
+            end_details['dateTime'] = _format_rfc3339(update_data.end.dateTime)
             if update_data.end.timeZone:
                 end_details['timeZone'] = update_data.end.timeZone
         elif update_data.end.date:
@@ -370,37 +696,69 @@ def update_event(
             
     # Handle attendees - PATCH replaces the attendee list
     if update_data.attendees is not None:
-        # Convert EventAttendee models back to simple dicts for API
-        update_body['attendees'] = [
-            attendee.dict(by_alias=True, exclude_unset=True) 
-            for attendee in update_data.attendees
-        ]
+        # Convert EventAttendee models back to simple dicts for API, as one
+        # pydantic-core serializer call for the whole list
+        update_body['attendees'] = _ATTENDEE_LIST_ADAPTER.dump_python(
+            update_data.attendees, by_alias=True, exclude_unset=True
+        )
     # Add other updatable fields from EventUpdateRequest if needed
 
+    return update_body
+
+def update_event(
+    credentials: Credentials,
+    event_id: str,
+    update_data: EventUpdateRequest, # Use Pydantic model for partial update data
+    calendar_id: str = 'primary',
+    send_notifications: bool = True, # Whether to send notifications
+    batch: Optional['BatchHttpRequest'] = None
+) -> Optional[GoogleCalendarEvent]:
+    """Updates an existing event using patch semantics (only specified fields are changed).
+
+    Args:
+        credentials: Valid Google OAuth2 credentials.
+        event_id: The ID of the event to update.
+        update_data: An EventUpdateRequest object containing fields to update.
+        calendar_id: Calendar identifier.
+        send_notifications: Whether to send update notifications to attendees.
+        batch: If given, the patch is added to this batch instead of being executed;
+               its result goes to the batch callback.
+
+    Returns:
+        A GoogleCalendarEvent object representing the updated event, or None if an error
+        occurs or the request was added to a batch.
+
+    Raises:
+        ValueError: update_data has no fields to change. No request is made then;
+            use find_events to read the event.
+    """
+    update_body = _build_update_body(update_data)
     if not update_body:
-        logger.warning(f"Update called for event {event_id} with no fields to update.")
-        # Optionally, retrieve and return the existing event data?
-        # For now, return None or raise an error, as no update was performed.
-        # Let's retrieve the existing event to provide some feedback.
-        try:
-            existing_event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-            return GoogleCalendarEvent(**existing_event)
-        except HttpError as e:
-            logger.error(f"Failed to retrieve event {event_id} after empty update request: {e}")
-            return None
+        # Nothing to patch, so no request is sent: not even a GET to echo the event back
+        logger.warning("update_event: no fields provided for event %s; skipping.", event_id)
+        raise ValueError(f"No fields to update were provided for event '{event_id}'.")
+
+    logger.info("Updating event '%s' in calendar '%s'.", event_id, calendar_id)
+    logger.debug("Update body for patch: %s", update_body)
 
-    logger.info(f"Updating event '{event_id}' in calendar '{calendar_id}'.")
-    logger.debug(f"Update body for patch: {update_body}")
+    service = _get_calendar_service(credentials)
+    request = service.events().patch(
+        calendarId=calendar_id,
+        eventId=event_id,
+        body=update_body,
+        sendNotifications=send_notifications
+    )
+    if batch is not None:
+        # The cached attendees may not survive the patch
+        _forget_attendees(calendar_id, event_id)
+        batch.add(request)
+        return None
 
     try:
-        updated_event = service.events().patch(
-            calendarId=calendar_id,
-            eventId=event_id,
-            body=update_body,
-            sendNotifications=send_notifications
-        ).execute()
+        updated_event = request.execute()
 
-        logger.info(f"Successfully updated event '{event_id}'.")
+        logger.info("Successfully updated event '%s'.", event_id)
+        _remember_attendees(calendar_id, event_id, updated_event)
 
         # Parse the updated event using Pydantic model
         parsed_event = GoogleCalendarEvent(**updated_event)
@@ -411,13 +769,7 @@ def update_event(
         if error.resp.status == 404:
             logger.error(f"Event '{event_id}' not found in calendar '{calendar_id}'.")
         else:
-            # Log detailed error content
-            error_content = "Unknown error content"
-            try:
-                error_content = error.content.decode('utf-8')
-            except Exception:
-                pass
-            logger.error(f"Google API error while updating event '{event_id}': {error.resp.status} - {error_content}", exc_info=True)
+            _log_http_error(error, f"updating event '{event_id}'")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred while updating event '{event_id}': {e}", exc_info=True)
@@ -427,7 +779,8 @@ def delete_event(
     credentials: Credentials,
     event_id: str,
     calendar_id: str = 'primary',
-    send_notifications: bool = True # Whether to send notifications
+    send_notifications: bool = True, # Whether to send notifications
+    batch: Optional['BatchHttpRequest'] = None
 ) -> bool:
     """Deletes an event.
 
@@ -436,24 +789,32 @@ def delete_event(
         event_id: The ID of the event to delete.
         calendar_id: Calendar identifier.
         send_notifications: Whether to send deletion notifications to attendees.
+        batch: If given, the delete is added to this batch instead of being executed;
+               its result goes to the batch callback.
 
     Returns:
-        True if the event was deleted successfully, False otherwise.
+        True if the event was deleted successfully (or the delete was added to a
+        batch), False otherwise.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return False
 
-    logger.info(f"Attempting to delete event '{event_id}' from calendar '{calendar_id}'.")
+    logger.info("Attempting to delete event '%s' from calendar '%s'.", event_id, calendar_id)
+
+    request = service.events().delete(
+        calendarId=calendar_id,
+        eventId=event_id,
+        sendNotifications=send_notifications
+    )
+    if batch is not None:
+        _forget_attendees(calendar_id, event_id)
+        batch.add(request)
+        return True
 
     try:
-        service.events().delete(
-            calendarId=calendar_id,
-            eventId=event_id,
-            sendNotifications=send_notifications
-        ).execute()
+        request.execute()
         # Delete returns no content on success (204)
-        logger.info(f"Successfully deleted event '{event_id}'.")
+        logger.info("Successfully deleted event '%s'.", event_id)
+        _forget_attendees(calendar_id, event_id)
         return True
 
     except HttpError as error:
@@ -461,13 +822,7 @@ def delete_event(
         if error.resp.status in [404, 410]:
             logger.error(f"Event '{event_id}' not found or already deleted in calendar '{calendar_id}'. Cannot delete.")
         else:
-            # Log detailed error content
-            error_content = "Unknown error content"
-            try:
-                error_content = error.content.decode('utf-8')
-            except Exception:
-                pass
-            logger.error(f"Google API error while deleting event '{event_id}': {error.resp.status} - {error_content}", exc_info=True)
+            _log_http_error(error, f"deleting event '{event_id}'")
         return False
     except Exception as e:
         logger.error(f"An unexpected error occurred while deleting event '{event_id}': {e}", exc_info=True)
@@ -478,7 +833,8 @@ def add_attendee(
     event_id: str,
     attendee_emails: List[str], # Simple list of emails to add
     calendar_id: str = 'primary',
-    send_notifications: bool = True
+    send_notifications: bool = True,
+    batch: Optional['BatchHttpRequest'] = None
 ) -> Optional[GoogleCalendarEvent]:
     """Adds one or more attendees to an existing event.
 
@@ -490,97 +846,115 @@ def add_attendee(
         attendee_emails: A list of email addresses to add/set as attendees.
         calendar_id: Calendar identifier.
         send_notifications: Whether to send update notifications.
+        batch: If given, the patch is added to this batch instead of being executed;
+               its result (including a 412 for a stale ETag, which is not retried)
+               goes to the batch callback. The current attendees are still read
+               first unless cached.
 
     Returns:
-        The updated GoogleCalendarEvent object, or None if an error occurs.
+        The updated GoogleCalendarEvent object, or None if an error occurs or the
+        request was added to a batch.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Attempting to add attendees {attendee_emails} to event '{event_id}' in calendar '{calendar_id}'.")
+    logger.info("Attempting to add attendees %s to event '%s' in calendar '%s'.", attendee_emails, event_id, calendar_id)
 
-    # 1. Get the existing event
-    try:
-        event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-        logger.debug(f"Retrieved existing event '{event_id}' for adding attendees.")
-    except HttpError as error:
-        if error.resp.status == 404:
-            logger.error(f"Event '{event_id}' not found in calendar '{calendar_id}'. Cannot add attendees.")
+    # The first attempt patches against the cached attendee list when there is one.
+    # The second, after a stale ETag (412), always works from a fresh read.
+    for attempt in range(2):
+        cached = _cached_attendees(calendar_id, event_id) if attempt == 0 else None
+        event = None
+
+        # 1. Get the existing event, unless its attendees are cached
+        if cached is not None:
+            etag, current_attendees = cached
+            logger.debug("Using cached attendees of event '%s' (ETag %s).", event_id, etag)
         else:
-            # Log detailed error content when retrieving event
-            error_content = "Unknown error content"
             try:
-                error_content = error.content.decode('utf-8')
-            except Exception:
-                pass
-            logger.error(f"Google API error retrieving event '{event_id}' for adding attendees: {error.resp.status} - {error_content}", exc_info=True)
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error retrieving event '{event_id}': {e}", exc_info=True)
-        return None
-
-    # 2. Modify the attendee list
-    # Get current attendees, ensuring it's a list
-    current_attendees = event.get('attendees', [])
-    if not isinstance(current_attendees, list):
-        current_attendees = [] # Ensure it's a list if API returns something unexpected
-
-    # Create a set of current attendee emails for efficient lookup
-    current_emails = {attendee.get('email') for attendee in current_attendees if attendee.get('email')}
-
-    # Prepare the list of new attendee objects to add
-    new_attendees_to_add = [
-        {'email': email} for email in attendee_emails if email not in current_emails
-    ]
-
-    if not new_attendees_to_add:
-        logger.warning(f"All provided attendees {attendee_emails} are already in event '{event_id}'. No update needed.")
-        # Return the current event data as no changes were made
-        return GoogleCalendarEvent(**event)
-
-    # Combine current and new attendees
-    updated_attendee_list = current_attendees + new_attendees_to_add
-
-    # 3. Prepare the patch body
-    patch_body = {
-        'attendees': updated_attendee_list
-    }
+                event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+                logger.debug("Retrieved existing event '%s' for adding attendees.", event_id)
+            except HttpError as error:
+                if error.resp.status == 404:
+                    logger.error(f"Event '{event_id}' not found in calendar '{calendar_id}'. Cannot add attendees.")
+                else:
+                    _log_http_error(error, f"retrieving event '{event_id}' for adding attendees")
+                return None
+            except Exception as e:
+                logger.error(f"Unexpected error retrieving event '{event_id}': {e}", exc_info=True)
+                return None
+            etag = event.get('etag')
+            current_attendees = event.get('attendees', [])
+
+        # 2. Modify the attendee list
+        # Ensure it's a list if API returns something unexpected
+        if not isinstance(current_attendees, list):
+            current_attendees = []
+
+        # Create a set of current attendee emails for efficient lookup
+        current_emails = {attendee.get('email') for attendee in current_attendees if attendee.get('email')}
+
+        # Prepare the list of new attendee objects to add
+        new_attendees_to_add = [
+            _attendee_dict(email) for email in attendee_emails if email not in current_emails
+        ]
 
-    # 4. Patch the event
-    logger.debug(f"Patching event '{event_id}' with updated attendees: {patch_body}")
-    try:
-        updated_event = service.events().patch(
+        if not new_attendees_to_add:
+            if event is None:
+                # Nothing to patch, but the caller gets the full event; read it
+                continue
+            logger.warning(f"All provided attendees {attendee_emails} are already in event '{event_id}'. No update needed.")
+            # Return the current event data as no changes were made
+            _remember_attendees(calendar_id, event_id, event)
+            return GoogleCalendarEvent(**event)
+
+        # Combine current and new attendees
+        updated_attendee_list = current_attendees + new_attendees_to_add
+
+        # 3. Prepare the patch body
+        patch_body = {
+            'attendees': updated_attendee_list
+        }
+
+        # 4. Patch the event, only if it is unchanged since the attendees were read
+        logger.debug("Patching event '%s' with updated attendees: %s", event_id, patch_body)
+        request = service.events().patch(
             calendarId=calendar_id,
             eventId=event_id,
             body=patch_body,
             sendNotifications=send_notifications
-        ).execute()
+        )
+        if etag:
+            request.headers['If-Match'] = etag
+        if batch is not None:
+            _forget_attendees(calendar_id, event_id)
+            batch.add(request)
+            return None
+        try:
+            updated_event = request.execute()
 
-        logger.info(f"Successfully added attendees to event '{event_id}'.")
+            logger.info("Successfully added attendees to event '%s'.", event_id)
+            _remember_attendees(calendar_id, event_id, updated_event)
 
-        # Parse the updated event using Pydantic model
-        parsed_event = GoogleCalendarEvent(**updated_event)
-        return parsed_event
+            # Parse the updated event using Pydantic model
+            parsed_event = GoogleCalendarEvent(**updated_event)
+            return parsed_event
 
-    except HttpError as error:
-        # Log detailed error content when patching event
-        error_content = "Unknown error content"
-        try:
-            error_content = error.content.decode('utf-8')
-        except Exception:
-            pass
-        logger.error(f"Google API error occurred while patching event '{event_id}' with new attendees: {error.resp.status} - {error_content}", exc_info=True)
-        return None
-    except Exception as e:
-        logger.error(f"An unexpected error occurred while patching event '{event_id}' with new attendees: {e}", exc_info=True)
-        return None
+        except HttpError as error:
+            if error.resp.status == 412 and attempt == 0:
+                logger.info("Event '%s' changed since its attendees were read. Retrying with a fresh copy.", event_id)
+                _forget_attendees(calendar_id, event_id)
+                continue
+            _log_http_error(error, f"patching event '{event_id}' with new attendees")
+            return None
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while patching event '{event_id}' with new attendees: {e}", exc_info=True)
+            return None
 
 def find_calendars(
     credentials: Credentials,
     min_access_role: Optional[str] = None # e.g., 'reader', 'writer', 'owner'
 ) -> Optional[CalendarListResponse]:
-    """Lists the calendars on the user's calendar list.
+    """Lists the calendars on the user's calendar list, following every page.
 
     Args:
         credentials: Valid Google OAuth2 credentials.
@@ -590,32 +964,33 @@ def find_calendars(
         A CalendarListResponse object containing the list of calendars, or None if an error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Fetching calendar list. Min access role: {min_access_role}")
+    logger.info("Fetching calendar list. Min access role: %s", min_access_role)
 
-    # Paginate? For simplicity, get first page for now.
-    # Add maxResults if needed.
     try:
-        calendar_list = service.calendarList().list(
-            minAccessRole=min_access_role
-        ).execute()
-
-        logger.info(f"Found {len(calendar_list.get('items', []))} calendars in the list.")
+        calendar_lists = service.calendarList()
+        # 250 is the API's page size limit, so most users fit in one page
+        request = calendar_lists.list(minAccessRole=min_access_role, maxResults=250)
+        calendar_list = request.execute()
+        items = calendar_list.get('items', [])
+        while True:
+            request = calendar_lists.list_next(request, calendar_list)
+            if request is None:
+                break
+            calendar_list = request.execute()
+            items.extend(calendar_list.get('items', []))
+        # The last page carries the sync token; the merged list has no next page
+        calendar_list['items'] = items
+        calendar_list.pop('nextPageToken', None)
+
+        logger.info("Found %s calendars in the list.", len(items))
 
         # Parse the result using Pydantic model
-        parsed_list = CalendarListResponse(**calendar_list)
+        parsed_list = CalendarListResponse.model_validate(calendar_list)
         return parsed_list
 
     except HttpError as error:
-        logger.error(f"An API error occurred while fetching calendar list: {error}", exc_info=True)
-        # Add more detailed logging if possible
-        try:
-            error_content = error.content.decode('utf-8')
-            logger.error(f"Google API error details (find_calendars): {error.resp.status} - {error_content}")
-        except Exception:
-            logger.error(f"Google API error details (find_calendars): {error.resp.status} - Could not decode error content.")
+        _log_http_error(error, "fetching calendar list")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred while fetching calendar list: {e}", exc_info=True)
@@ -635,10 +1010,8 @@ def create_calendar(
         A CalendarListEntry object representing the created calendar, or None if an error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Attempting to create a new calendar with summary: '{summary}'")
+    logger.info("Attempting to create a new calendar with summary: '%s'", summary)
 
     calendar_body = {
         'summary': summary
@@ -647,7 +1020,7 @@ def create_calendar(
 
     try:
         created_calendar = service.calendars().insert(body=calendar_body).execute()
-        logger.info(f"Successfully created calendar with ID: {created_calendar.get('id')}")
+        logger.info("Successfully created calendar with ID: %s", created_calendar.get('id'))
 
         # The response is a Calendar resource, parse it using CalendarListEntry model
         # (Structure is identical for relevant fields)
@@ -655,14 +1028,7 @@ def create_calendar(
         return parsed_calendar
 
     except HttpError as error:
-        logger.error(f"An API error occurred while creating calendar '{summary}': {error}", exc_info=True)
-        # Log detailed error content
-        error_content = "Unknown error content"
-        try:
-            error_content = error.content.decode('utf-8')
-        except Exception:
-            pass
-        logger.error(f"Google API error occurred while creating calendar '{summary}': {error.resp.status} - {error_content}", exc_info=True)
+        _log_http_error(error, f"creating calendar '{summary}'")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred while creating calendar '{summary}': {e}", exc_info=True)
@@ -689,26 +1055,18 @@ def check_attendee_status(
         or None if the event is not found or an error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Checking attendee status for event '{event_id}' in calendar '{calendar_id}'. Target emails: {attendee_emails or 'All'}")
+    logger.info("Checking attendee status for event '%s' in calendar '%s'. Target emails: %s", event_id, calendar_id, attendee_emails or 'All')
 
     try:
         event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-        logger.debug(f"Retrieved event '{event_id}' for status check.")
+        logger.debug("Retrieved event '%s' for status check.", event_id)
 
     except HttpError as error:
         if error.resp.status == 404:
             logger.error(f"Event '{event_id}' not found in calendar '{calendar_id}'. Cannot check status.")
         else:
-            # Log detailed error content
-            error_content = "Unknown error content"
-            try:
-                error_content = error.content.decode('utf-8')
-            except Exception:
-                pass
-            logger.error(f"Google API error retrieving event '{event_id}' for status check: {error.resp.status} - {error_content}", exc_info=True)
+            _log_http_error(error, f"retrieving event '{event_id}' for status check")
         return None
     except Exception as e:
         logger.error(f"Unexpected error retrieving event '{event_id}': {e}", exc_info=True)
@@ -716,7 +1074,7 @@ def check_attendee_status(
 
     attendees = event.get('attendees', [])
     if not attendees:
-        logger.info(f"Event '{event_id}' has no attendees.")
+        logger.info("Event '%s' has no attendees.", event_id)
         return {}
 
     status_map: Dict[str, str] = {}
@@ -736,7 +1094,7 @@ def check_attendee_status(
             # Otherwise, include all attendees
             status_map[email] = status
 
-    logger.info(f"Attendee statuses retrieved for event '{event_id}': {len(status_map)} attendees found.")
+    logger.info("Attendee statuses retrieved for event '%s': %s attendees found.", event_id, len(status_map))
     return status_map
 
 def find_availability(
@@ -761,17 +1119,14 @@ def find_availability(
         Returns None if a major API error occurs.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
     if not calendar_ids:
         logger.warning("find_availability called with empty calendar_ids list.")
         return {}
 
     # Ensure time_min and time_max are in RFC3339 format
-    # Add 'Z' for UTC if timezone is naive, otherwise format appropriately
-    time_min_str = time_min.isoformat() + ('Z' if time_min.tzinfo is None else '')
-    time_max_str = time_max.isoformat() + ('Z' if time_max.tzinfo is None else '')
+    time_min_str = _format_rfc3339(time_min)
+    time_max_str = _format_rfc3339(time_max)
 
     request_body = {
         "timeMin": time_min_str,
@@ -780,12 +1135,12 @@ def find_availability(
         # Optional: Add groupExpansionMax, calendarExpansionMax if needed
     }
 
-    logger.info(f"Querying free/busy information for calendars: {calendar_ids} between {time_min_str} and {time_max_str}")
-    logger.debug(f"Free/busy request body: {request_body}")
+    logger.info("Querying free/busy information for calendars: %s between %s and %s", calendar_ids, time_min_str, time_max_str)
+    logger.debug("Free/busy request body: %s", request_body)
 
     try:
         freebusy_result = service.freebusy().query(body=request_body).execute()
-        logger.debug(f"Free/busy raw response: {freebusy_result}")
+        logger.debug("Free/busy raw response: %s", freebusy_result)
 
         # Process the response into a more usable format
         processed_results: Dict[str, Dict[str, Any]] = {}
@@ -795,9 +1150,10 @@ def find_availability(
             busy_intervals = []
             for interval in data.get('busy', []):
                 try:
-                    # Parse RFC3339 strings back to datetime objects
-                    start_dt = parser.isoparse(interval.get('start'))
-                    end_dt = parser.isoparse(interval.get('end'))
+                    # Parse RFC3339 strings back to datetime objects; fromisoformat
+                    # accepts them (including 'Z') on Python 3.11+
+                    start_dt = datetime.fromisoformat(interval.get('start'))
+                    end_dt = datetime.fromisoformat(interval.get('end'))
                     busy_intervals.append({'start': start_dt, 'end': end_dt})
                 except (TypeError, ValueError) as parse_error:
                     logger.warning(f"Could not parse busy interval for {cal_id}: {interval}. Error: {parse_error}")
@@ -808,18 +1164,11 @@ def find_availability(
                 'errors': data.get('errors', []) # Keep API errors as is
             }
 
-        logger.info(f"Successfully retrieved free/busy information for {len(processed_results)} calendars.")
+        logger.info("Successfully retrieved free/busy information for %s calendars.", len(processed_results))
         return processed_results
 
     except HttpError as error:
-        logger.error(f"An API error occurred during free/busy query: {error}", exc_info=True)
-        # Log detailed error content
-        error_content = "Unknown error content"
-        try:
-            error_content = error.content.decode('utf-8')
-        except Exception:
-            pass
-        logger.error(f"Google API error occurred during free/busy query: {error.resp.status} - {error_content}", exc_info=True)
+        _log_http_error(error, "querying free/busy information")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred during free/busy query: {e}", exc_info=True)
@@ -859,15 +1208,15 @@ def _find_first_available_slot(
        Ensures the search starts from the current time if time_min is in the past.
     """
     logger.info("--- Entering _find_first_available_slot ---")
-    logger.debug(f"Initial inputs: time_min={time_min}, time_max={time_max}, duration={duration}")
+    logger.debug("Initial inputs: time_min=%s, time_max=%s, duration=%s", time_min, time_max, duration)
 
     # --- Ensure Timezones (use UTC for consistency) ---
     try:
-        logger.debug(f"Original time_min tz: {time_min.tzinfo}, time_max tz: {time_max.tzinfo}")
+        logger.debug("Original time_min tz: %s, time_max tz: %s", time_min.tzinfo, time_max.tzinfo)
         time_min_utc = time_min.astimezone(timezone.utc) if time_min.tzinfo else time_min.replace(tzinfo=timezone.utc)
         time_max_utc = time_max.astimezone(timezone.utc) if time_max.tzinfo else time_max.replace(tzinfo=timezone.utc)
         now_utc = datetime.now(timezone.utc)
-        logger.debug(f"Normalized to UTC: time_min={time_min_utc}, time_max={time_max_utc}, now={now_utc}")
+        logger.debug("Normalized to UTC: time_min=%s, time_max=%s, now=%s", time_min_utc, time_max_utc, now_utc)
     except Exception as tz_err:
         logger.error(f"Error normalizing timezones to UTC: {tz_err}")
         # Fallback, though less ideal
@@ -884,7 +1233,7 @@ def _find_first_available_slot(
     # Determine effective start time (MUST be in the future)
     effective_start = max(time_min_utc, now_utc)
     # Log at INFO level for visibility
-    logger.info(f"Search range: {time_min_utc} to {time_max_utc}. Current time: {now_utc}. Effective start for search: {effective_start}")
+    logger.info("Search range: %s to %s. Current time: %s. Effective start for search: %s", time_min_utc, time_max_utc, now_utc, effective_start)
 
     # Adjust merged busy intervals to be UTC as well for correct comparison
     busy_intervals_utc = []
@@ -902,7 +1251,7 @@ def _find_first_available_slot(
 
     # --- Refactored Slot Finding Logic ---
     current_search_time = effective_start
-    logger.info(f"Search pointer initialized to: {current_search_time}")
+    logger.info("Search pointer initialized to: %s", current_search_time)
 
     # --- Working Hours Check (Placeholder - implement timezone logic if needed) ---
     def is_within_working_hours(slot_start: datetime, slot_end: datetime) -> bool:
@@ -927,7 +1276,7 @@ def _find_first_available_slot(
 
         # Check if slot goes beyond the overall search window
         if potential_end_time > time_max_utc:
-            logger.info(f"Potential slot end {potential_end_time} exceeds time_max {time_max_utc}. Search finished.")
+            logger.info("Potential slot end %s exceeds time_max %s. Search finished.", potential_end_time, time_max_utc)
             break # Stop searching
 
         # Check for overlap with any busy interval
@@ -937,7 +1286,7 @@ def _find_first_available_slot(
             # Overlap definition: (SlotStart < BusyEnd) and (SlotEnd > BusyStart)
             if current_search_time < busy['end'] and potential_end_time > busy['start']:
                 # Overlap found. Move search time to the end of this busy interval.
-                logger.debug(f"Potential slot {current_search_time} - {potential_end_time} overlaps with busy {busy['start']} - {busy['end']}. Jumping search time.")
+                logger.debug("Potential slot %s - %s overlaps with busy %s - %s. Jumping search time.", current_search_time, potential_end_time, busy['start'], busy['end'])
                 current_search_time = busy['end']
                 overlap_found = True
                 break # Break inner loop, restart outer while loop check
@@ -949,14 +1298,14 @@ def _find_first_available_slot(
         # Check working hours
         # TODO: Implement proper timezone conversion for working hours check if needed
         if is_within_working_hours(current_search_time, potential_end_time):
-            logger.info(f"Found available slot: {current_search_time} - {potential_end_time}")
+            logger.info("Found available slot: %s - %s", current_search_time, potential_end_time)
             return current_search_time, potential_end_time
         else:
             # Slot is free but outside working hours. Move search time forward.
             # A simple jump might be to the start of the next working hour block, 
             # but for now, just advance slightly to check the next possible interval.
             # Advancing by duration ensures we check the next non-overlapping slot.
-            logger.debug(f"Slot {current_search_time} - {potential_end_time} rejected due to working hours. Advancing search time.")
+            logger.debug("Slot %s - %s rejected due to working hours. Advancing search time.", current_search_time, potential_end_time)
             current_search_time += timedelta(minutes=15) # Or duration? Let's try 15 min increment.
             
     # Looped through entire window without finding a suitable slot
@@ -996,11 +1345,9 @@ def find_mutual_availability_and_schedule(
         otherwise None.
     """
     service = _get_calendar_service(credentials)
-    if not service:
-        return None
 
-    logger.info(f"Attempting to find mutual availability and schedule for: {attendee_calendar_ids}")
-    logger.info(f"Search window: {time_min} to {time_max}, Duration: {duration_minutes} mins")
+    logger.info("Attempting to find mutual availability and schedule for: %s", attendee_calendar_ids)
+    logger.info("Search window: %s to %s, Duration: %s mins", time_min, time_max, duration_minutes)
 
     # 1. Find availability for all attendees
     availability_data = find_availability(
@@ -1025,7 +1372,7 @@ def find_mutual_availability_and_schedule(
         all_busy_intervals.extend(data.get('busy', []))
 
     merged_busy = _merge_intervals(all_busy_intervals)
-    logger.debug(f"Merged busy intervals: {merged_busy}")
+    logger.debug("Merged busy intervals: %s", merged_busy)
 
     # 3. Find the first available slot
     duration = timedelta(minutes=duration_minutes)
@@ -1043,7 +1390,7 @@ def find_mutual_availability_and_schedule(
         return None
 
     slot_start, slot_end = available_slot
-    logger.info(f"Found available slot: {slot_start} - {slot_end}")
+    logger.info("Found available slot: %s - %s", slot_start, slot_end)
 
     # 4. Prepare full event data
     # Create a copy to avoid modifying the original input
@@ -1068,7 +1415,7 @@ def find_mutual_availability_and_schedule(
             final_event_data.attendees.append(email)
             existing_attendees.add(email) # Keep track
 
-    logger.debug(f"Final event data for creation: {final_event_data.dict(by_alias=True)}")
+    logger.debug("Final event data for creation: %s", final_event_data.dict(by_alias=True))
 
     # 5. Create the event
     created_event = create_event(
@@ -1079,7 +1426,7 @@ def find_mutual_availability_and_schedule(
     )
 
     if created_event:
-        logger.info(f"Successfully scheduled event '{created_event.summary}' (ID: {created_event.id}) at {slot_start}")
+        logger.info("Successfully scheduled event '%s' (ID: %s) at %s", created_event.summary, created_event.id, slot_start)
     else:
         logger.error("Failed to create the event after finding an available slot.")
 
@@ -1092,8 +1439,10 @@ def get_projected_recurring_events(
     time_min: datetime,
     time_max: datetime,
     calendar_id: str = 'primary',
-    event_query: Optional[str] = None
-) -> List[ProjectedEventOccurrence]:
+    event_query: Optional[str] = None,
+    calendar_ids: Optional[List[str]] = None,
+    expand_on_server: bool = True
+) -> Optional[List[ProjectedEventOccurrence]]:
     """Wrapper function to find recurring events and project their occurrences.
 
     This calls the core logic in the analysis module.
@@ -1104,25 +1453,36 @@ def get_projected_recurring_events(
         time_max: End of the projection window (timezone-aware recommended).
         calendar_id: The calendar to search within.
         event_query: Optional text query to filter master recurring events (e.g., "Birthday").
+        calendar_ids: Optional list of calendars to search instead of calendar_id (batched).
+        expand_on_server: Let the API expand recurrences when no query is given.
 
     Returns:
-        A list of ProjectedEventOccurrence objects representing calculated occurrences.
+        A list of ProjectedEventOccurrence objects representing calculated occurrences,
+        or None on error.
     """
-    logger.info(f"Action: get_projected_recurring_events called for calendar '{calendar_id}'")
+    logger.info("Action: get_projected_recurring_events called for calendar '%s'", calendar_id)
     # Directly call the analysis function
-    return project_recurring_events(
-        credentials=credentials,
-        time_min=time_min,
-        time_max=time_max,
-        calendar_id=calendar_id,
-        event_query=event_query
-    )
+    try:
+        return project_recurring_events(
+            credentials=credentials,
+            time_min=time_min,
+            time_max=time_max,
+            calendar_id=calendar_id,
+            event_query=event_query,
+            calendar_ids=calendar_ids,
+            expand_on_server=expand_on_server
+        )
+    except Exception as e:
+        # A failed page; a partial projection would look complete
+        logger.error(f"Error during recurring event projection: {e}", exc_info=True)
+        return None # Return None to signal error to the server endpoint
 
 def get_busyness_analysis(
     credentials: Credentials,
     time_min: datetime,
     time_max: datetime,
     calendar_id: str = 'primary',
+    fill_zero_days: bool = False
 ) -> Optional[Dict[date, Dict[str, Any]]]:
     """Wrapper function to analyze daily event busyness.
 
@@ -1133,11 +1493,12 @@ def get_busyness_analysis(
         time_min: Start of the analysis window (timezone-aware recommended).
         time_max: End of the analysis window (timezone-aware recommended).
         calendar_id: The calendar to analyze.
+        fill_zero_days: Include days without events with zero stats.
 
     Returns:
         A dictionary mapping each date to its busyness stats, or None on error.
     """
-    logger.info(f"Action: get_busyness_analysis called for calendar '{calendar_id}'")
+    logger.info("Action: get_busyness_analysis called for calendar '%s'", calendar_id)
     # Directly call the analysis function
     # Add error handling if analyze_busyness itself can raise specific exceptions
     try:
@@ -1146,6 +1507,7 @@ def get_busyness_analysis(
             time_min=time_min,
             time_max=time_max,
             calendar_id=calendar_id,
+            fill_zero_days=fill_zero_days,
         )
     except Exception as e:
         # Log the specific error from the analysis function
@@ -1,25 +1,38 @@
 import datetime # Import the module itself
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List, Dict, Any
+import re
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List, Dict, Any
 # from datetime import datetime, date # Keep original import commented for reference
 
+# Email addresses are checked with one compiled pattern rather than email-validator;
+# Google validates attendees server-side, so this only rejects obvious typos early.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def _check_email(value: str) -> str:
+    if not _EMAIL_RE.match(value):
+        raise ValueError(f"'{value}' is not a valid email address")
+    return value
+
+# For request bodies; emails coming back from the API are plain str
+EmailAddress = Annotated[str, AfterValidator(_check_email)]
+
 # Based on Google Calendar API v3 Event resource documentation:
 # https://developers.google.com/calendar/api/v3/reference/events#resource
 
+# Resources returned by the API are read-only once parsed, so they are frozen:
+# instances can be shared safely (e.g. across cached responses) without defensive copies.
 class EventDateTime(BaseModel):
     """Represents the start or end time of an event."""
     date: Optional[datetime.date] = None
     dateTime: Optional[datetime.datetime] = None  # Renamed from 'date_time' to match API JSON
     timeZone: Optional[str] = None  # Renamed from 'time_zone'
 
-    class Config:
-        populate_by_name = True  # Changed from allow_population_by_field_name
-        # orm_mode = True # Removed, orm_mode is deprecated in Pydantic V2, use from_attributes=True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 class EventAttendee(BaseModel):
     """Represents an attendee of an event."""
     id: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     displayName: Optional[str] = None  # Renamed from 'display_name'
     organizer: Optional[bool] = None
     self: Optional[bool] = None
@@ -29,45 +42,37 @@ class EventAttendee(BaseModel):
     comment: Optional[str] = None
     additionalGuests: Optional[int] = None  # Renamed from 'additional_guests'
 
-    class Config:
-        populate_by_name = True  # Changed from allow_population_by_field_name
-        # orm_mode = True # Removed, orm_mode is deprecated in Pydantic V2, use from_attributes=True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 class EventCreator(BaseModel):
     """Represents the creator of an event."""
     id: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     display_name: Optional[str] = Field(None, alias='displayName')
     self: Optional[bool] = None # Whether the creator corresponds to the calendar on which this copy of the event appears.
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 class EventOrganizer(BaseModel):
     """Represents the organizer of an event."""
     id: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     display_name: Optional[str] = Field(None, alias='displayName')
     self: Optional[bool] = None # Whether the organizer corresponds to the calendar on which this copy of the event appears.
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 class EventReminderOverride(BaseModel):
     method: Optional[str] = None
     minutes: Optional[int] = None
 
-    class Config:
-        populate_by_name = True  # Changed from allow_population_by_field_name
-        # orm_mode = True # Removed, orm_mode is deprecated in Pydantic V2, use from_attributes=True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 class EventReminders(BaseModel):
     useDefault: bool = Field(..., alias="useDefault")  # Renamed from 'use_default'
     overrides: Optional[List[EventReminderOverride]] = None
 
-    class Config:
-        populate_by_name = True  # Changed from allow_population_by_field_name
-        # orm_mode = True # Removed, orm_mode is deprecated in Pydantic V2, use from_attributes=True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 # --- Main Event Model --- 
 
@@ -91,14 +96,13 @@ class GoogleCalendarEvent(BaseModel):
     recurrence: Optional[List[str]] = Field(None, description="List of RRULE, EXRULE, RDATE or EXDATE properties for recurring events.")
     recurring_event_id: Optional[str] = Field(None, alias='recurringEventId', description="For an instance of a recurring event, this is the id of the recurring event itself.")
     original_start_time: Optional[EventDateTime] = Field(None, alias='originalStartTime', description="For an instance of a recurring event, this is the original start time of the instance before modification.")
-    attendees: Optional[List[EventAttendee]] = Field([], description="The attendees of the event.")
+    attendees: Optional[List[EventAttendee]] = Field(default_factory=list, description="The attendees of the event.")
     attendees_omitted: Optional[bool] = Field(None, alias='attendeesOmitted', description="Whether attendees were omitted.")
     reminders: Optional[EventReminders] = Field(None, description="Information about the event's reminders.")
     # Add other fields as needed (e.g., attachments, conferenceData, gadget, source, etc.)
 
-    class Config:
-        populate_by_name = True
-        # Consider adding validation logic, e.g., ensuring start is before end
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+    # Consider adding validation logic, e.g., ensuring start is before end
 
 # --- Models for API Requests/Responses --- 
 
@@ -109,7 +113,7 @@ class EventCreateRequest(BaseModel):
     end: EventDateTime
     description: Optional[str] = None
     location: Optional[str] = None
-    attendees: Optional[List[EmailStr]] = Field(None, description="List of attendee email addresses to invite.")
+    attendees: Optional[List[EmailAddress]] = Field(None, description="List of attendee email addresses to invite.")
     recurrence: Optional[List[str]] = Field(None, description="List of RRULEs, EXRULEs, RDATEs or EXDATEs for recurring events.")
     reminders: Optional[EventReminders] = Field(None, description="Notification settings for the event.")
     # Add other creatable fields as needed
@@ -132,7 +136,7 @@ class EventUpdateRequest(BaseModel):
 
 class AddAttendeeRequest(BaseModel):
     """Model for adding attendees to an existing event."""
-    attendee_emails: List[EmailStr] = Field(..., description="List of email addresses to add as attendees.")
+    attendee_emails: List[EmailAddress] = Field(..., description="List of email addresses to add as attendees.")
 
 # You might also want models for CalendarList entries, etc.
 
@@ -141,11 +145,12 @@ class NotificationSettings(BaseModel):
     """Represents notification settings for a calendar."""
     notifications: Optional[List[Dict[str, str]]] = None # List of {'type': 'eventCreation', 'method': 'email'} etc.
 
-    class Config:
-        populate_by_name = True # Changed from allow_population_by_field_name
+    model_config = ConfigDict(populate_by_name=True)
 
 class CalendarListEntry(BaseModel):
     """Represents an entry in the user's calendar list."""
+    model_config = ConfigDict(frozen=True)
+
     kind: str = "calendar#calendarListEntry"
     etag: str
     id: str
@@ -168,7 +173,7 @@ class CalendarListEntry(BaseModel):
 class CalendarListResponse(BaseModel):
     """Response containing a list of calendars."""
     kind: str = "calendar#calendarList"
-    items: List[CalendarListEntry] = []
+    items: List[CalendarListEntry] = Field(default_factory=list)
     nextPageToken: Optional[str] = None
     nextSyncToken: Optional[str] = None
 
@@ -181,8 +186,8 @@ class EventsResponse(BaseModel):
     updated: Optional[datetime.datetime] = None
     timeZone: Optional[str] = None
     accessRole: Optional[str] = None
-    defaultReminders: Optional[List[EventReminderOverride]] = []
-    items: List[GoogleCalendarEvent] = []
+    defaultReminders: Optional[List[EventReminderOverride]] = Field(default_factory=list)
+    items: List[GoogleCalendarEvent] = Field(default_factory=list)
     nextPageToken: Optional[str] = None
     nextSyncToken: Optional[str] = None
 
@@ -194,8 +199,8 @@ class CalendarList(BaseModel):
     nextSyncToken: Optional[str] = None # Renamed from 'next_sync_token'
     items: List[CalendarListEntry]
 
-    class Config:
-        populate_by_name = True # Changed from allow_population_by_field_name
+    # Not used on any request path; build the schema only if it is ever validated
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 # --- Models for Advanced Actions --- 
 
@@ -203,10 +208,10 @@ class CalendarList(BaseModel):
 class CheckAttendeeStatusRequest(BaseModel):
     event_id: str
     calendar_id: str = 'primary'
-    attendee_emails: Optional[List[EmailStr]] = None
+    attendee_emails: Optional[List[EmailAddress]] = None
 
 class CheckAttendeeStatusResponse(BaseModel):
-    status_map: Dict[EmailStr, str] = Field(..., description="Mapping of attendee email to their responseStatus ('accepted', 'declined', etc.)")
+    status_map: Dict[str, str] = Field(..., description="Mapping of attendee email to their responseStatus ('accepted', 'declined', etc.)")
 
 # --- Find Availability (Free/Busy) ---
 class FreeBusyRequestItem(BaseModel):
@@ -219,10 +224,11 @@ class FreeBusyRequest(BaseModel):
     # Optional: timeZone, groupExpansionMax, calendarExpansionMax
     time_zone: Optional[str] = Field(None, alias='timeZone')
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class TimePeriod(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     start: datetime.datetime
     end: datetime.datetime
 
@@ -231,18 +237,19 @@ class FreeBusyError(BaseModel):
     reason: str
 
 class CalendarBusyInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     errors: Optional[List[FreeBusyError]] = None
-    busy: List[TimePeriod] = []
+    busy: List[TimePeriod] = Field(default_factory=list)
 
 class FreeBusyResponse(BaseModel):
     kind: str = "calendar#freeBusy"
     time_min: datetime.datetime = Field(..., alias='timeMin')
     time_max: datetime.datetime = Field(..., alias='timeMax')
-    calendars: Dict[str, CalendarBusyInfo] = {}
+    calendars: Dict[str, CalendarBusyInfo] = Field(default_factory=dict)
     # Optional: groups
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 # --- Find Mutual Availability & Schedule ---
 class ScheduleMutualRequest(BaseModel):
@@ -273,6 +280,8 @@ class ProjectedEventOccurrenceModel(BaseModel):
     occurrence_end: datetime.datetime
 
 class ProjectRecurringResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     projected_occurrences: List[ProjectedEventOccurrenceModel]
 
 # --- Analyze Busyness ---
@@ -286,5 +295,15 @@ class DailyBusynessStats(BaseModel):
     total_duration_minutes: float
 
 class AnalyzeBusynessResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     # Use string representation for date keys in JSON
-    busyness_by_date: Dict[str, DailyBusynessStats] = Field(..., description="Mapping of date string (YYYY-MM-DD) to busyness stats") 
\ No newline at end of file
+    busyness_by_date: Dict[str, DailyBusynessStats] = Field(..., description="Mapping of date string (YYYY-MM-DD) to busyness stats") 
+# Response models built with defer_build skip schema construction at import; the HTTP
+# server builds them once at startup so the first request doesn't pay for it.
+_WARM_MODELS = (FreeBusyResponse, ProjectRecurringResponse, AnalyzeBusynessResponse)
+
+def warm_models() -> None:
+    """Builds the core schemas of the deferred response models ahead of first use."""
+    for model in _WARM_MODELS:
+        model.model_rebuild()
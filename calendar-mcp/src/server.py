@@ -23,12 +23,11 @@ from fastapi.routing import APIRoute
 from fastapi.openapi.utils import get_openapi
 from pydantic import BaseModel, Field
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 
 # Import functions and models directly using absolute imports
 try:
     # Use absolute imports for consistency
-    from src.auth import get_credentials
+    from src.auth import get_credentials_async
     import src.calendar_actions as calendar_actions
     from src.models import (
         GoogleCalendarEvent,
@@ -46,7 +45,8 @@ try:
         ProjectRecurringRequest, ProjectRecurringResponse, ProjectedEventOccurrenceModel,
         AnalyzeBusynessRequest, AnalyzeBusynessResponse, DailyBusynessStats,
         # Specific models needed for freeBusy conversion
-        CalendarBusyInfo, TimePeriod, FreeBusyError
+        CalendarBusyInfo, TimePeriod, FreeBusyError,
+        warm_models
     )
     from src.analysis import ProjectedEventOccurrence
     logger.info("Successfully imported modules")
@@ -67,12 +67,14 @@ app = FastAPI(
 global_credentials: Optional[Credentials] = None
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     """Attempt to get credentials on server startup."""
     global global_credentials
+    # Build the deferred response schemas now rather than on their first request
+    warm_models()
     logger.info("Server starting up. Attempting to authenticate with Google...")
     try:
-        global_credentials = get_credentials()
+        global_credentials = await get_credentials_async()
         if not global_credentials or not global_credentials.valid:
             # Log error but allow server to start; endpoints requiring auth will fail until fixed.
             logger.error("Failed to obtain valid Google credentials on startup. Endpoints requiring auth will be unavailable.")
@@ -84,56 +86,33 @@ def startup_event():
         global_credentials = None
 
 # --- Dependency for Credentials ---
-def get_current_credentials() -> Credentials:
-    """Dependency to provide valid credentials to endpoints. Attempts refresh if invalid."""
+async def get_current_credentials() -> Credentials:
+    """Dependency to provide valid credentials to endpoints. Refreshes them if they
+    expire soon.
+
+    Token file reads and refresh round trips run in worker threads, keeping the event
+    loop free for other requests.
+    """
     global global_credentials
 
-    if not global_credentials:
-        logger.warning("Credentials not available (failed during startup?). Attempting to re-fetch.")
-        try:
-            global_credentials = get_credentials()
-            if not global_credentials:
-                 raise HTTPException(
-                    status_code=503, 
-                    detail="Google API credentials are not available. Initial fetch failed."
-                )
-        except Exception as e:
-            logger.error(f"Failed to re-fetch credentials: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=503, 
-                detail=f"Google API credentials unavailable. Failed to re-fetch: {e}"
-            )
-    
-    # Check if valid, try refreshing if expired or invalid
-    if not global_credentials.valid:
-        logger.warning("Credentials are invalid or expired. Attempting refresh...")
-        try:
-            global_credentials.refresh(Request()) # Requires: from google.auth.transport.requests import Request
-            if not global_credentials.valid:
-                logger.error("Credential refresh succeeded but credentials still invalid.")
-                raise HTTPException(
-                    status_code=503, 
-                    detail="Google API credentials invalid after refresh attempt."
-                )
-            logger.info("Credentials refreshed successfully within dependency.")
-        except Exception as e:
-            logger.error(f"Failed to refresh credentials within dependency: {e}", exc_info=True)
-            # If refresh fails, try a full re-fetch as a last resort
-            logger.warning("Refresh failed. Attempting a full re-fetch of credentials...")
-            try:
-                global_credentials = get_credentials()
-                if not global_credentials or not global_credentials.valid:
-                    raise HTTPException(
-                        status_code=503,
-                        detail="Google API credentials unavailable after failed refresh and re-fetch."
-                    )
-                logger.info("Credentials re-fetched successfully after failed refresh.")
-            except Exception as inner_e:
-                logger.error(f"Failed to re-fetch credentials after failed refresh: {inner_e}", exc_info=True)
-                raise HTTPException(
-                    status_code=503, 
-                    detail=f"Google API credentials unavailable. Refresh and re-fetch failed: {inner_e}"
-                )
+    # Fresh cached credentials come back inline. Near expiry, auth refreshes them once
+    # under its lock and saves the new token, so concurrent requests never refresh
+    # the same Credentials object in parallel.
+    try:
+        creds = await get_credentials_async()
+    except Exception as e:
+        logger.error(f"Failed to obtain credentials within dependency: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Google API credentials unavailable. Refresh and re-fetch failed: {e}"
+        )
+    if not creds or not creds.valid:
+        logger.error("Credentials still unavailable or invalid after fetch.")
+        raise HTTPException(
+            status_code=503,
+            detail="Google API credentials are not available."
+        )
+    global_credentials = creds
 
     return global_credentials
 
@@ -437,13 +416,17 @@ def update_event_endpoint(
     """Updates specified fields of an existing event."""
     logger.info(f"Endpoint 'update_event' called for event '{event_id}' in calendar '{calendar_id}'.")
     logger.debug(f"Update data: {update_data.dict(exclude_unset=True)}")
-    result = calendar_actions.update_event(
-        credentials=creds,
-        event_id=event_id,
-        update_data=update_data,
-        calendar_id=calendar_id,
-        send_notifications=send_notifications
-    )
+    try:
+        result = calendar_actions.update_event(
+            credentials=creds,
+            event_id=event_id,
+            update_data=update_data,
+            calendar_id=calendar_id,
+            send_notifications=send_notifications
+        )
+    except ValueError as e:
+        # Nothing to change; update_event raises before calling the API
+        raise HTTPException(status_code=400, detail=str(e))
     if result is None:
         # update_event handles 404 logging, but we might want to return 404 here
         # Need a way for the action function to signal the error type
@@ -649,17 +632,26 @@ def project_recurring_endpoint(
     logger.debug(f"Time range: {request.time_min} to {request.time_max}")
     # Note: calendar_actions.get_projected_recurring_events returns List[ProjectedEventOccurrence]
     # We need to convert this to List[ProjectedEventOccurrenceModel] for the response.
-    occurrences: List[ProjectedEventOccurrence] = calendar_actions.get_projected_recurring_events(
+    occurrences: Optional[List[ProjectedEventOccurrence]] = calendar_actions.get_projected_recurring_events(
         credentials=creds,
         time_min=request.time_min,
         time_max=request.time_max,
         calendar_id=request.calendar_id,
         event_query=request.event_query
     )
+    if occurrences is None: # Wrapper returns None on error
+        logger.error("Action 'get_projected_recurring_events' returned None. Raising HTTPException.")
+        raise HTTPException(status_code=500, detail="Failed to project recurring events.")
 
     # Convert ProjectedEventOccurrence (from analysis) to ProjectedEventOccurrenceModel (from models)
     response_occurrences = [
-        ProjectedEventOccurrenceModel(**occ.__dict__) for occ in occurrences
+        ProjectedEventOccurrenceModel(
+            original_event_id=occ.original_event_id,
+            original_summary=occ.original_summary,
+            occurrence_start=occ.occurrence_start,
+            occurrence_end=occ.occurrence_end
+        )
+        for occ in occurrences
     ]
 
     logger.info(f"Endpoint 'project_recurring' completed. Found {len(response_occurrences)} projected occurrences.")